@@ -0,0 +1,270 @@
+# backtest.py
+"""
+Vectorized backtest of detect_signal_for_symbol: the EMA 7/30 cross, RSI filter, volume spike /
+reversal candle entry rules and the find_reversal_candle_level SL + MIN_RR TP are evaluated for
+every candle of every symbol at once on a (symbols x candles) panel, then trades are simulated
+forward until stop-loss, take-profit or MAX_HOLD candles.
+
+    python backtest.py --days 365 --interval 1h
+
+Indicators are computed over the whole history rather than a trailing KLINES_LIMIT window, so EMAs
+carry slightly less seed bias than the live scan; every other rule is the same.
+"""
+import argparse
+import asyncio
+import os
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+import multi_timeframe
+import patterns
+import suggest
+from kline_store import KlineStore
+from panel import build_panel, calculate_indicators_batch, ema
+
+MAX_HOLD = 500  # candles a trade may stay open before it's closed at market
+SL_LOOKBACK = 30  # same lookback detect_signal_for_symbol passes to find_reversal_candle_level
+EXIT_BLOCK = 128  # candles examined per vectorized exit-search step
+
+def _trailing(x: np.ndarray, window: int, reduce) -> np.ndarray:
+    """reduce (np.fmin / np.fmax) over the trailing `window` candles along axis 1, NaNs ignored."""
+    out = x.copy()
+    for k in range(1, window):
+        shifted = np.full_like(x, np.nan)
+        shifted[:, k:] = x[:, :-k]
+        out = reduce(out, shifted)
+    return out
+
+def _reversal_level(mask: np.ndarray, price: np.ndarray, fallback: np.ndarray, lookback: int) -> np.ndarray:
+    """Vectorized find_reversal_candle_level: price at the latest reversal candle in the window, else fallback."""
+    idx = np.arange(mask.shape[1])
+    last = np.maximum.accumulate(np.where(mask, idx, -1), axis=1)
+    found = (last >= 0) & (last > idx - lookback)
+    level = np.take_along_axis(price, np.maximum(last, 0), axis=1)
+    return np.where(found, level, fallback)
+
+# the strategy's tunable numbers; detect_signal_for_symbol hard-codes these values
+DEFAULT_PARAMS = {
+    "min_rr": suggest.MIN_RR,
+    "ema_fast": 7,
+    "ema_slow": 30,
+    "rsi_long_low": 20,
+    "rsi_long_high": 70,
+    "rsi_short_low": 30,
+    "rsi_short_high": 80,
+    "vol_mult": 1.5,
+}
+
+def prepare(panel: Dict[str, np.ndarray]) -> Dict:
+    """Parameter-independent columns: RSI, volume MA, reversal candles and SL levels (shareable across parameter sets)."""
+    ind = calculate_indicators_batch(panel)
+    o, h, l, c = panel['open'], panel['high'], panel['low'], panel['close']
+    sl_long = _reversal_level(patterns.bullish_reversal(o, h, l, c), l, _trailing(l, SL_LOOKBACK, np.fmin), SL_LOOKBACK)
+    sl_short = _reversal_level(patterns.bearish_reversal(o, h, l, c), h, _trailing(h, SL_LOOKBACK, np.fmax), SL_LOOKBACK)
+    return {
+        'ema': {7: ind['ema7'], 30: ind['ema30']},  # span -> EMA, extended on demand by compute_signals
+        'rsi': ind['rsi'],
+        'vol_ma20': ind['vol_ma20'],
+        'candle_up': patterns.hammer(o, h, l, c) | patterns.bullish_engulfing(o, c),
+        # a signal needs MIN_KLINES candles of history, like the live scan
+        'enough': np.cumsum(~np.isnan(c), axis=1) >= suggest.MIN_KLINES,
+        'sl_long': np.where(sl_long >= c, c * 0.995, sl_long),
+        'sl_short': np.where(sl_short <= c, c * 1.005, sl_short),
+    }
+
+def _ema_for(panel: Dict[str, np.ndarray], features: Dict, span: int) -> np.ndarray:
+    cache = features['ema']
+    if span not in cache:
+        cache[span] = ema(panel['close'], span)
+    return cache[span]
+
+def compute_signals(panel: Dict[str, np.ndarray], params: Dict | None = None,
+                    features: Dict | None = None) -> Dict[str, np.ndarray]:
+    """Entry masks and SL/TP levels for every (symbol, candle) of the panel."""
+    p = dict(DEFAULT_PARAMS, **(params or {}))
+    f = prepare(panel) if features is None else features
+    c, v = panel['close'], panel['volume']
+    e_fast = _ema_for(panel, f, p['ema_fast'])
+    e_slow = _ema_for(panel, f, p['ema_slow'])
+    rsi = f['rsi']
+
+    cross_up = np.zeros_like(c, dtype=bool)
+    cross_down = np.zeros_like(c, dtype=bool)
+    cross_up[:, 1:] = (e_fast[:, :-1] < e_slow[:, :-1]) & (e_fast[:, 1:] > e_slow[:, 1:])
+    cross_down[:, 1:] = (e_fast[:, :-1] > e_slow[:, :-1]) & (e_fast[:, 1:] < e_slow[:, 1:])
+    with np.errstate(invalid='ignore'):
+        rsi_ok_long = (rsi > p['rsi_long_low']) & (rsi < p['rsi_long_high'])
+        rsi_ok_short = (rsi > p['rsi_short_low']) & (rsi < p['rsi_short_high'])
+        vol_spike = v > p['vol_mult'] * f['vol_ma20']
+    candle_up = f['candle_up']
+
+    long_entry = f['enough'] & cross_up & rsi_ok_long & (vol_spike | candle_up)
+    short_entry = f['enough'] & cross_down & rsi_ok_short & (vol_spike | ~candle_up)
+    sl_long, sl_short = f['sl_long'], f['sl_short']
+    return {
+        'long': long_entry,
+        'short': short_entry,
+        'sl_long': sl_long,
+        'sl_short': sl_short,
+        'tp_long': c + (c - sl_long) * p['min_rr'],
+        'tp_short': c - (sl_short - c) * p['min_rr'],
+    }
+
+def simulate(panel: Dict[str, np.ndarray], sym_idx: np.ndarray, t_idx: np.ndarray, is_long: np.ndarray,
+             sl: np.ndarray, tp: np.ndarray, max_hold: int = MAX_HOLD) -> Dict[str, np.ndarray]:
+    """
+    Walk every trade forward from the candle after entry. A candle touching both SL and TP counts
+    as a stop (conservative); a stop gapped through exits at that candle's open. Trades still open
+    after `max_hold` candles or at the end of data exit at the last close examined.
+    """
+    o, h, l, c = panel['open'], panel['high'], panel['low'], panel['close']
+    N = c.shape[1]
+    n = len(t_idx)
+    entry = c[sym_idx, t_idx]
+    exit_price = np.full(n, np.nan)
+    exit_idx = np.full(n, -1, dtype=np.int64)
+    outcome = np.full(n, 'open', dtype=object)
+    todo = np.arange(n)
+    for offset in range(1, max_hold + 1, EXIT_BLOCK):
+        if not len(todo):
+            break
+        steps = np.arange(offset, min(offset + EXIT_BLOCK, max_hold + 1))
+        cols = t_idx[todo, None] + steps[None, :]
+        valid = cols < N
+        cols = np.minimum(cols, N - 1)
+        rows = sym_idx[todo, None]
+        lo, hi, op = l[rows, cols], h[rows, cols], o[rows, cols]
+        lng = is_long[todo, None]
+        s, t = sl[todo, None], tp[todo, None]
+        with np.errstate(invalid='ignore'):
+            stop = valid & np.where(lng, lo <= s, hi >= s)
+            take = valid & np.where(lng, hi >= t, lo <= t)
+        hit = stop | take
+        first = np.argmax(hit, axis=1)
+        done = hit.any(axis=1)
+        r = np.arange(len(todo))
+        stopped = done & stop[r, first]
+        gap_fill = np.where(is_long[todo], np.minimum(op[r, first], sl[todo]), np.maximum(op[r, first], sl[todo]))
+        px = np.where(stopped, gap_fill, tp[todo])
+        finished = todo[done]
+        exit_price[finished] = px[done]
+        exit_idx[finished] = cols[r, first][done]
+        outcome[finished] = np.where(stopped[done], 'stop', 'target')
+        todo = todo[~done]
+        # out of data: nothing left to examine for these
+        todo = todo[t_idx[todo] + steps[-1] < N - 1]
+    # timeouts: trades with at least one candle after entry that never hit a level
+    left = np.flatnonzero((outcome == 'open') & (t_idx < N - 1))
+    last = np.minimum(t_idx[left] + max_hold, N - 1)
+    exit_price[left] = c[sym_idx[left], last]
+    exit_idx[left] = last
+    outcome[left] = 'timeout'
+    risk = np.abs(entry - sl)
+    r_mult = np.where(is_long, exit_price - entry, entry - exit_price) / np.maximum(risk, 1e-9)
+    return {'entry': entry, 'exit_price': exit_price, 'exit_idx': exit_idx, 'outcome': outcome, 'r': r_mult}
+
+def build_timestamps(frames: Dict[str, pd.DataFrame], width: int) -> np.ndarray:
+    """(S, N) candle timestamps aligned like build_panel (-1 where padded)."""
+    ts = np.full((len(frames), width), -1, dtype=np.int64)
+    for row, df in enumerate(frames.values()):
+        n = len(df)
+        if n:
+            ts[row, width - n:] = df['timestamp'].to_numpy(dtype=np.int64)
+    return ts
+
+def run_backtest(frames: Dict[str, pd.DataFrame], max_hold: int = MAX_HOLD, params: Dict | None = None) -> Tuple[Dict, pd.DataFrame]:
+    """Backtest every symbol's kline frame; returns (summary, trades)."""
+    panel = build_panel(list(frames.values()))
+    if not panel['close'].size:
+        return summarize(pd.DataFrame()), pd.DataFrame()
+    ts = build_timestamps(frames, panel['close'].shape[1])
+    return backtest_panel(panel, ts, list(frames), max_hold=max_hold, params=params)
+
+def backtest_panel(panel: Dict[str, np.ndarray], ts: np.ndarray, symbols: List[str], max_hold: int = MAX_HOLD,
+                   params: Dict | None = None, features: Dict | None = None) -> Tuple[Dict, pd.DataFrame]:
+    """run_backtest on a prebuilt panel; pass `features` from prepare() to reuse them across calls."""
+    p = dict(DEFAULT_PARAMS, **(params or {}))
+    sig = compute_signals(panel, p, features)
+    ls, lt = np.nonzero(sig['long'])
+    ss, st = np.nonzero(sig['short'])
+    sym_idx = np.r_[ls, ss]
+    t_idx = np.r_[lt, st]
+    is_long = np.r_[np.ones(len(ls), dtype=bool), np.zeros(len(ss), dtype=bool)]
+    sl = np.r_[sig['sl_long'][ls, lt], sig['sl_short'][ss, st]]
+    tp = np.r_[sig['tp_long'][ls, lt], sig['tp_short'][ss, st]]
+    res = simulate(panel, sym_idx, t_idx, is_long, sl, tp, max_hold=max_hold)
+
+    exit_ts = np.where(res['exit_idx'] >= 0, ts[sym_idx, np.maximum(res['exit_idx'], 0)], -1)
+    trades = pd.DataFrame({
+        'symbol': np.array(symbols, dtype=object)[sym_idx] if len(sym_idx) else [],
+        'direction': np.where(is_long, 'Long', 'Short'),
+        'entry_ts': ts[sym_idx, t_idx],
+        'entry': res['entry'],
+        'stop_loss': sl,
+        'take_profit': tp,
+        'exit_ts': exit_ts,
+        'exit': res['exit_price'],
+        'outcome': res['outcome'],
+        'r': res['r'],
+    }).sort_values(['entry_ts', 'symbol'], kind='stable').reset_index(drop=True)
+    return summarize(trades), trades
+
+def summarize(trades: pd.DataFrame) -> Dict:
+    """Win rate, expectancy (mean R per trade) and realized RR (avg win / avg loss) over closed trades."""
+    closed = trades[trades['outcome'] != 'open'] if len(trades) else trades
+    if not len(closed):
+        return {"trades": 0, "open": int(len(trades)), "win_rate": None, "expectancy_r": None, "realized_rr": None}
+    r = closed['r'].to_numpy()
+    wins, losses = r[r > 0], r[r <= 0]
+    return {
+        "trades": int(len(closed)),
+        "open": int(len(trades) - len(closed)),
+        "targets": int((closed['outcome'] == 'target').sum()),
+        "stops": int((closed['outcome'] == 'stop').sum()),
+        "timeouts": int((closed['outcome'] == 'timeout').sum()),
+        "win_rate": round(float(len(wins) / len(r)), 4),
+        "expectancy_r": round(float(r.mean()), 4),
+        "realized_rr": round(float(wins.mean() / -losses.mean()), 4) if len(wins) and len(losses) and losses.mean() < 0 else None,
+        "total_r": round(float(r.sum()), 2),
+    }
+
+async def load_history_async(symbols: List[str], interval: str, candles: int) -> Dict[str, pd.DataFrame]:
+    """Page `candles` of history per symbol into a KlineStore (on disk under KLINE_CACHE_DIR/history when set)."""
+    cache_dir = os.path.join(suggest.KLINE_CACHE_DIR, "history") if suggest.KLINE_CACHE_DIR else None
+    store = KlineStore(capacity=candles, cache_dir=cache_dir)
+    sem = asyncio.Semaphore(suggest.SCAN_CONCURRENCY)
+
+    async def one(sym: str):
+        async with sem:
+            await multi_timeframe.fetch_base_klines(sym, interval, candles, store=store)
+
+    await asyncio.gather(*(one(s) for s in symbols))
+    store.flush()
+    return {s: store.buffer(s, interval).frame() for s in symbols if len(store.buffer(s, interval))}
+
+def _main(args) -> None:
+    symbols = [s for s in args.symbols.split(",") if s] if args.symbols else \
+        [p['symbol'] for p in suggest.fetch_high_volume_usdt_pairs(args.min_volume)][:args.top]
+    candles = args.days * 86400 // suggest.INTERVAL_SECONDS[args.interval]
+    frames = asyncio.run(load_history_async(symbols, args.interval, candles))
+    started = time.perf_counter()
+    summary, trades = run_backtest(frames, max_hold=args.max_hold)
+    summary["symbols"] = len(frames)
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    print(summary)
+    if args.out:
+        trades.to_csv(args.out, index=False)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest detect_signal_for_symbol over stored klines")
+    parser.add_argument("--symbols", help="comma-separated symbols (default: high-volume universe)")
+    parser.add_argument("--top", type=int, default=100)
+    parser.add_argument("--min-volume", type=int, default=suggest.DEFAULT_MIN_VOLUME)
+    parser.add_argument("--interval", default=suggest.INTERVAL)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--max-hold", type=int, default=MAX_HOLD)
+    parser.add_argument("--out", help="write the trade list as CSV")
+    _main(parser.parse_args())
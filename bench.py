@@ -0,0 +1,279 @@
+# bench.py
+"""
+Stage-by-stage benchmark of the scan pipeline against a local stub of the MEXC REST API.
+
+    python bench.py                              # synthetic fixtures, universes of 10/100/1000
+    python bench.py --record fixtures/           # save real ticker + kline responses once
+    python bench.py --fixtures fixtures/         # replay them
+
+Each stage is timed separately (ticker download + filter, kline download, kline parsing,
+calculate_indicators, pattern detection, detect_signal_for_symbol, formatting, and the cold
+end-to-end scan). Every run is appended to bench_results.json under the current git commit,
+so numbers can be compared across commits.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List
+
+import numpy as np
+
+import decode
+import http_client
+import suggest
+import symbol_index
+from kline_store import KlineStore
+from ratelimit import limiter
+from signal_memo import SignalMemo
+
+SIZES = [10, 100, 1000]
+TICKER_SYMBOLS = 2500  # roughly the size of MEXC's spot ticker list
+RESULTS_PATH = "bench_results.json"
+
+def synthetic_fixtures(n_pairs: int, candles: int = suggest.KLINES_LIMIT, seed: int = 7) -> Dict:
+    """
+    A ticker payload with TICKER_SYMBOLS entries (the first `n_pairs` are high-volume USDT pairs),
+    a contract detail listing for those pairs and one contract-style kline payload per pair,
+    random walks from a fixed seed.
+    """
+    rng = np.random.default_rng(seed)
+    tickers, contracts, klines = [], [], {}
+    end = int(time.time()) // 3600 * 3600
+    ts = end - 3600 * np.arange(candles)[::-1]
+    for i in range(TICKER_SYMBOLS):
+        quote = "USDT" if i < n_pairs or i % 3 else "BTC"
+        symbol = f"SYM{i:04d}{quote}"
+        volume = suggest.DEFAULT_MIN_VOLUME * (2 + rng.random()) if i < n_pairs else rng.random() * 1e6
+        tickers.append({"symbol": symbol, "lastPrice": f"{rng.uniform(0.01, 100):.6f}",
+                        "quoteVolume": f"{volume:.2f}", "volume": f"{volume / 10:.2f}"})
+        if i >= n_pairs:
+            continue
+        contract = f"SYM{i:04d}_USDT"
+        contracts.append({"symbol": contract, "baseCoin": f"SYM{i:04d}", "quoteCoin": "USDT", "state": 0})
+        close = 10 * np.cumprod(1 + rng.normal(0, 0.01, candles))
+        open_ = np.r_[close[0], close[:-1]]
+        high = np.maximum(open_, close) * (1 + rng.random(candles) * 0.005)
+        low = np.minimum(open_, close) * (1 - rng.random(candles) * 0.005)
+        klines[contract] = {"success": True, "code": 200, "data": {
+            "time": ts.tolist(), "open": open_.round(6).tolist(), "close": close.round(6).tolist(),
+            "high": high.round(6).tolist(), "low": low.round(6).tolist(),
+            "vol": (rng.random(candles) * 1e5).round(2).tolist(),
+        }}
+    return {"tickers": tickers, "contracts": contracts, "klines": klines}
+
+def load_fixtures(path: str) -> Dict:
+    with open(os.path.join(path, "tickers.json")) as f:
+        tickers = json.load(f)
+    with open(os.path.join(path, "contracts.json")) as f:
+        contracts = json.load(f).get("data") or []
+    klines = {}
+    kdir = os.path.join(path, "klines")
+    for name in sorted(os.listdir(kdir)):
+        with open(os.path.join(kdir, name)) as f:
+            klines[name[:-len(".json")]] = json.load(f)
+    return {"tickers": tickers, "contracts": contracts, "klines": klines}
+
+def record_fixtures(path: str, n_pairs: int) -> None:
+    """Save the live ticker list, contract listing and klines of the `n_pairs` highest-volume USDT pairs."""
+    os.makedirs(os.path.join(path, "klines"), exist_ok=True)
+    for url, name, weight in ((suggest.MEXC_TICKER_URL, "tickers.json", suggest.TICKER_WEIGHT),
+                              (symbol_index.CONTRACT_DETAIL_URL, "contracts.json", 1)):
+        r = http_client.get(url, weight=weight)
+        r.raise_for_status()
+        with open(os.path.join(path, name), "wb") as f:
+            f.write(r.content)
+    for p in suggest.fetch_high_volume_usdt_pairs(0)[:n_pairs]:
+        url = suggest.MEXC_KLINES_URL.format(symbol=p['symbol'], interval=suggest.INTERVAL, limit=suggest.KLINES_LIMIT)
+        r = http_client.get(url, weight=suggest.KLINES_WEIGHT)
+        if r.status_code == 200:
+            with open(os.path.join(path, "klines", f"{p['symbol']}.json"), "wb") as f:
+                f.write(r.content)
+
+class StubServer:
+    """Serves fixture payloads on 127.0.0.1 at the MEXC ticker, contract detail and kline paths."""
+
+    def __init__(self, fixtures: Dict):
+        ticker_body = json.dumps(fixtures["tickers"]).encode()
+        detail_body = json.dumps({"success": True, "code": 0, "data": fixtures["contracts"]}).encode()
+        kline_bodies = {s: json.dumps(k).encode() for s, k in fixtures["klines"].items()}
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/api/v3/ticker/24hr":
+                    body = ticker_body
+                elif path == "/api/v1/contract/detail":
+                    body = detail_body
+                else:
+                    body = kline_bodies.get(path.rsplit("/", 1)[-1])
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def patch(self) -> None:
+        """Point suggest's endpoints at the stub (with a throwaway symbol index) and lift the rate limit for it."""
+        suggest.MEXC_TICKER_URL = self.url + "/api/v3/ticker/24hr"
+        suggest.MEXC_KLINES_URL = self.url + "/api/v1/contract/kline/{symbol}?interval={interval}&limit={limit}"
+        suggest.MEXC_KLINES_SINCE_URL = self.url + "/api/v1/contract/kline/{symbol}?interval={interval}&start={start}"
+        symbol_index.CONTRACT_DETAIL_URL = self.url + "/api/v1/contract/detail"
+        symbol_index.SYMBOL_INDEX_PATH = os.path.join(tempfile.mkdtemp(), "symbol_index.json")
+        symbol_index.index_cache.invalidate()
+        limiter.budgets["127.0.0.1"] = (1e9, 1.0)
+
+    def close(self) -> None:
+        self.server.shutdown()
+
+def _time(fn: Callable[[], object], repeat: int) -> Dict:
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - started)
+    return {"median_s": round(statistics.median(runs), 6), "min_s": round(min(runs), 6)}
+
+def _reset_scan_state() -> None:
+    """Fresh kline store and memo, so the end-to-end scan runs cold."""
+    suggest.kline_store = KlineStore(capacity=suggest.KLINES_LIMIT)
+    suggest.signal_memo = SignalMemo()
+
+def bench_universe(fixtures: Dict, size: int, repeat: int) -> Dict:
+    # recorded fixtures may lack klines for a few listed pairs
+    pairs = [p for p in suggest.fetch_high_volume_usdt_pairs() if p['symbol'] in fixtures["klines"]][:size]
+    symbols = [p['symbol'] for p in pairs]
+    # raw bodies, so parsing is timed from bytes like fetch_klines sees them
+    bodies = [json.dumps(fixtures["klines"][s]).encode() for s in symbols]
+    frames = [suggest._klines_to_frame(decode.loads(body)) for body in bodies]
+    indicator_frames = [suggest.calculate_indicators(df) for df in frames]
+    signals = [sig for sig in (suggest.detect_signal_on_indicators(df, s) for df, s in zip(indicator_frames, symbols)) if sig]
+    for sig in signals:
+        sig['volume_24h'] = 123456789.0
+    to_format = (signals * (size // max(1, len(signals)) + 1))[:size] if signals else []
+
+    def tickers():
+        suggest.spot_tickers.invalidate()
+        suggest.fetch_high_volume_usdt_pairs()
+
+    def klines_http():
+        async def run():
+            sem = asyncio.Semaphore(suggest.SCAN_CONCURRENCY)
+
+            async def one(sym):
+                async with sem:
+                    return await suggest.fetch_klines_async(sym)
+            try:
+                await asyncio.gather(*(one(s) for s in symbols))
+            finally:
+                await http_client.close_async_client()
+        asyncio.run(run())
+
+    def patterns_stage():
+        for df in frames:
+            last = len(df) - 1
+            suggest.is_hammer(df, last)
+            suggest.is_bullish_engulfing(df, last)
+            suggest.find_reversal_candle_level(df, bullish=True)
+            suggest.find_reversal_candle_level(df, bullish=False)
+
+    def scan():
+        _reset_scan_state()
+
+        async def run():
+            try:
+                await suggest.scan_pairs_async(pairs, limit=len(pairs))
+            finally:
+                await http_client.close_async_client()
+        asyncio.run(run())
+
+    stages = {
+        "fetch_high_volume_usdt_pairs": tickers,
+        "fetch_klines_http": klines_http,
+        "klines_parse": lambda: [suggest._klines_to_frame(decode.loads(body)) for body in bodies],
+        "calculate_indicators": lambda: [suggest.calculate_indicators(df) for df in frames],
+        "pattern_detection": patterns_stage,
+        "detect_signal_for_symbol": lambda: [suggest.detect_signal_on_indicators(df, s) for df, s in zip(indicator_frames, symbols)],
+        "format_suggestion": lambda: [suggest.format_suggestion(sig) for sig in to_format],
+        "scan_end_to_end": scan,
+    }
+    out = {"symbols": len(symbols), "signals": len(signals)}
+    for name, fn in stages.items():
+        out[name] = _time(fn, repeat)
+    return out
+
+def _commit() -> str:
+    """Commit the results belong to; a working tree with uncommitted changes is marked `-dirty`."""
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+def save_results(path: str, entry: Dict) -> None:
+    """Append `entry` to the JSON list at `path`, replacing an earlier run of the same commit."""
+    history: List[Dict] = []
+    if os.path.exists(path):
+        with open(path) as f:
+            history = json.load(f)
+    history = [h for h in history if h.get("commit") != entry["commit"]] + [entry]
+    with open(path, "w") as f:
+        json.dump(history, f, indent=1)
+        f.write("\n")
+
+def _main(args) -> None:
+    sizes = [int(s) for s in args.sizes.split(",")]
+    if args.record:
+        record_fixtures(args.record, max(sizes))
+        print("fixtures written to", args.record)
+        return
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else synthetic_fixtures(max(sizes))
+    stub = StubServer(fixtures)
+    stub.patch()
+    results = {}
+    try:
+        for size in sizes:
+            results[str(size)] = bench_universe(fixtures, size, args.repeat)
+            row = results[str(size)]
+            print(f"universe {size}: " + ", ".join(
+                f"{k} {v['median_s'] * 1000:.1f}ms" for k, v in row.items() if isinstance(v, dict)))
+    finally:
+        stub.close()
+    save_results(args.out, {
+        "commit": _commit(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "fixtures": args.fixtures or "synthetic",
+        "repeat": args.repeat,
+        "results": results,
+    })
+    print("results appended to", args.out)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scan pipeline stage by stage against a local API stub")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="comma-separated universe sizes")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--fixtures", help="directory of recorded fixtures (default: synthetic)")
+    parser.add_argument("--record", help="record live MEXC fixtures into this directory and exit")
+    parser.add_argument("--out", default=RESULTS_PATH)
+    _main(parser.parse_args())
@@ -1,7 +1,17 @@
 import os
 import logging
-import requests
-import random
+import asyncio
+import time
+import decode
+import http_client
+import metrics
+import suggest
+import symbol_index
+import tickers
+from multi_timeframe import SCAN_TIMEFRAMES
+from scanner import BackgroundScanner, seconds_until_candle_close, format_age
+from ticker_cache import TTLCache
+from ws_feed import MarketStream
 from telegram import Update
 from telegram.ext import ApplicationBuilder, CommandHandler, ContextTypes
 
@@ -11,64 +21,111 @@ logging.basicConfig(
     level=logging.INFO
 )
 
+# --- Streaming market data (MARKET_STREAM=1) instead of hourly REST scans ---
+MARKET_STREAM = os.getenv("MARKET_STREAM", "0") == "1"
+
 # --- Bot token ---
 TOKEN = os.getenv("8060081170:AAGL3GZsRBhyFUuEQf1PYP-8azEnr3v_2sQ")  # ✅ Store BOT_TOKEN in Render Environment Variables
 
 # --- Get high volume MEXC Futures pairs ---
+CONTRACT_TICKER_URL = "https://contract.mexc.com/api/v1/contract/ticker"
+
+def _load_contract_tickers():
+    # raise on error replies, so the cache keeps its last good table (or retries) instead of caching []
+    r = http_client.get(CONTRACT_TICKER_URL, timeout=10)
+    r.raise_for_status()
+    res = decode.loads(r.content)
+    if not res.get("success", True):
+        raise ValueError(f"contract ticker error: code={res.get('code')} {res.get('message') or ''}")
+    data = res.get("data")
+    if not data:
+        raise ValueError("contract ticker returned no data")
+    return tickers.ticker_table(data, volume_key="turnover24h")
+
+contract_tickers = TTLCache(_load_contract_tickers, name="contract_tickers")
+
 def get_high_volume_pairs():
-    url = "https://contract.mexc.com/api/v1/contract/ticker"
     try:
-        resp = requests.get(url, timeout=10).json()
-        filtered = [
-            pair["symbol"]
-            for pair in resp.get("data", [])
-            if float(pair["turnover24h"]) >= 40_000_000
-        ]
-        return filtered
+        table = tickers.high_volume(contract_tickers.get(), 40_000_000)
+        return symbol_index.listed_contracts(table['symbol'].tolist())
     except Exception as e:
         logging.error(f"Error fetching MEXC data: {e}")
+        metrics.ERRORS.labels("tickers").inc()
         return []
 
-# --- AI-like trade suggestion generator ---
-def generate_trade_signal(symbol):
-    direction = random.choice(["LONG", "SHORT"])
-    entry = round(random.uniform(0.9, 1.1), 4)  # Placeholder price
-    sl = round(entry * (0.98 if direction == "LONG" else 1.02), 4)
-    tp = round(entry * (1.04 if direction == "LONG" else 0.96), 4)
-    reason = (
-        "Volume spike + bullish reversal candle"
-        if direction == "LONG"
-        else "Resistance rejection + bearish engulfing"
-    )
-    return {
-        "symbol": symbol,
-        "direction": direction,
-        "entry": entry,
-        "sl": sl,
-        "tp": tp,
-        "reason": reason
-    }
+# --- Background scan: refresh the signal snapshot once per candle close ---
+SUGGEST_LIMIT = 3
+SUGGEST_TIMEOUT = 45  # seconds an on-demand scan may take before the reply gives up
+MAX_ON_DEMAND_SCANS = 2  # on-demand scans allowed at once across all chats
+# e.g. SCAN_TIMEFRAMES=5m,15m,1h,4h: fetch 5m once and resample into the higher timeframes
+scanner = BackgroundScanner(timeframes=SCAN_TIMEFRAMES or None)
+on_demand_scans = asyncio.Semaphore(MAX_ON_DEMAND_SCANS)
 
-# --- /suggest command handler ---
-async def suggest(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    pairs = get_high_volume_pairs()
+async def scan_job(context: ContextTypes.DEFAULT_TYPE):
+    await scanner.refresh()
+
+async def run_market_stream():
+    pairs = await asyncio.to_thread(get_high_volume_pairs)
     if not pairs:
-        await update.message.reply_text("No high-volume pairs found right now.")
+        logging.error("Market stream: no high-volume pairs, not starting")
         return
+    # republish on every close, so signals that expired without a new one leave the snapshot too
+    stream = MarketStream(pairs, interval=scanner.interval,
+                          on_close=lambda sym: scanner.publish(stream.current_signals()))
+    await stream.backfill()
+    logging.info(f"Market stream: streaming {len(pairs)} pairs")
+    await stream.run()
 
-    reply = "📊 **Scalping Trade Suggestions**\n\n"
-    for symbol in pairs[:3]:
-        trade = generate_trade_signal(symbol)
-        reply += (
-            f"💎 {trade['symbol']}\n"
-            f"📈 Direction: {trade['direction']}\n"
-            f"🎯 Entry: {trade['entry']}\n"
-            f"📉 SL: {trade['sl']}\n"
-            f"🚀 TP: {trade['tp']}\n"
-            f"📌 Reason: {trade['reason']}\n\n"
-        )
+async def post_init(app):
+    if MARKET_STREAM:
+        app.create_task(run_market_stream())
+
+# --- /suggest command handler ---
+async def reply_suggestions(update: Update) -> str:
+    """Answer /suggest; returns where the answer came from (snapshot, busy, on_demand, timeout, error)."""
+    snapshot = scanner.snapshot
+    if snapshot is not None:
+        age = format_age(snapshot.age())
+        if not snapshot.signals:
+            await update.message.reply_text(f"No trade setups in the latest scan ({age} ago).")
+            return "snapshot"
+        reply = "📊 **Scalping Trade Suggestions**\n\n"
+        reply += "\n\n".join(suggest.format_suggestion(sig) for sig in snapshot.signals[:SUGGEST_LIMIT])
+        reply += f"\n\n_Scanned {age} ago_"
+        await update.message.reply_text(reply, parse_mode="Markdown")
+        return "snapshot"
 
+    # no snapshot yet (first background scan still running): scan on demand, capped and time-boxed
+    if on_demand_scans.locked():
+        await update.message.reply_text("Market scan in progress, try again in a moment.")
+        return "busy"
+    async with on_demand_scans:
+        try:
+            signals = await asyncio.wait_for(
+                suggest.get_trade_signals_async(limit=SUGGEST_LIMIT),
+                timeout=SUGGEST_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            metrics.ERRORS.labels("suggest_timeout").inc()
+            await update.message.reply_text("Market scan timed out, try again in a moment.")
+            return "timeout"
+        except Exception as e:
+            logging.error(f"On-demand scan failed: {e}")
+            metrics.ERRORS.labels("suggest").inc()
+            await update.message.reply_text("Market scan failed, try again in a moment.")
+            return "error"
+    if not signals:
+        await update.message.reply_text("No trade setups right now.")
+        return "on_demand"
+    reply = "📊 **Scalping Trade Suggestions**\n\n"
+    reply += "\n\n".join(suggest.format_suggestion(sig) for sig in signals)
     await update.message.reply_text(reply, parse_mode="Markdown")
+    return "on_demand"
+
+async def suggest_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    started = time.perf_counter()
+    source = await reply_suggestions(update)
+    metrics.REPLY_SECONDS.labels(source).observe(time.perf_counter() - started)
 
 # --- Main bot runner ---
 if __name__ == "__main__":
@@ -76,8 +133,19 @@ if __name__ == "__main__":
         logging.error("BOT_TOKEN is not set in environment variables!")
         exit(1)
 
-    app = ApplicationBuilder().token(TOKEN).build()
-    app.add_handler(CommandHandler("suggest", suggest))
+    # handle updates concurrently so one slow /suggest never holds up other chats
+    app = ApplicationBuilder().token(TOKEN).concurrent_updates(True).post_init(post_init).build()
+    app.add_handler(CommandHandler("suggest", suggest_command))
+    # Prometheus /metrics on METRICS_PORT, served from a thread next to the polling loop
+    metrics.start_server()
+    # scan right away, then shortly after every candle close (the stream triggers on closes itself)
+    app.job_queue.run_once(scan_job, when=0)
+    if not MARKET_STREAM:
+        app.job_queue.run_repeating(
+            scan_job,
+            interval=suggest.INTERVAL_SECONDS[scanner.interval],
+            first=seconds_until_candle_close(scanner.interval),
+        )
     app.run_polling()
 
     app.run_polling()
@@ -0,0 +1,58 @@
+# decode.py
+"""
+Fast decoding of MEXC REST payloads. Bodies are parsed with orjson when it's installed (stdlib
+json otherwise) and kline rows go straight into one contiguous float64 block, so there are no
+per-field float() calls or pandas object-to-float casts on the hot path (tickers: see tickers.py).
+"""
+import json
+from typing import Dict, List
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional, stdlib json works too
+    orjson = None
+
+KLINE_WIDTH = 6  # timestamp, open, high, low, close, volume (kline_store.COLUMNS)
+# contract kline response arrays, in kline_store.COLUMNS order
+CONTRACT_KLINE_FIELDS = ('time', 'open', 'high', 'low', 'close', 'vol')
+
+def loads(content: bytes | str):
+    """Parse a JSON body."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def _ascending(klines: np.ndarray) -> np.ndarray:
+    """Rows sorted by timestamp; one argsort, and only when they aren't ascending already."""
+    ts = klines[:, 0]
+    if len(ts) > 1 and not (ts[1:] >= ts[:-1]).all():
+        klines = klines[np.argsort(ts, kind='stable')]
+    return klines
+
+def kline_rows(rows: List[list]) -> np.ndarray:
+    """
+    (n, 6) float64 array, oldest first, from list-style kline rows ([time, open, high, low, close,
+    volume, ...], numbers or numeric strings); extra trailing fields are dropped.
+    """
+    if not rows:
+        return np.empty((0, KLINE_WIDTH))
+    width = min(len(r) for r in rows)
+    if width > KLINE_WIDTH:
+        rows = [r[:KLINE_WIDTH] for r in rows]
+    return _ascending(np.array(rows, dtype=np.float64))
+
+def contract_klines(data: Dict[str, list]) -> np.ndarray:
+    """
+    (n, 6) float64 array, oldest first, from the contract endpoint's parallel arrays
+    (time/open/high/low/close/vol). Each array is copied once into its own contiguous row of a
+    (6, n) block and the transposed view is returned, which is already the column layout pandas
+    keeps internally. Arrays of unequal length are cut to the shortest.
+    """
+    columns = [data.get(key) or [] for key in CONTRACT_KLINE_FIELDS]
+    n = min(len(col) for col in columns)
+    block = np.empty((KLINE_WIDTH, n))
+    for j, col in enumerate(columns):
+        block[j] = col if len(col) == n else col[:n]
+    return _ascending(block.T)
@@ -0,0 +1,159 @@
+# http_client.py
+import asyncio
+import os
+import threading
+import time
+from typing import Dict
+
+import httpx
+
+import metrics
+from ratelimit import limiter
+
+# pool settings (override via environment)
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE", "30"))  # seconds an idle connection is kept per host
+HTTP2 = os.getenv("HTTP2", "0") == "1"  # needs the `h2` package
+DEFAULT_TIMEOUT = 8
+
+class PoolStats:
+    """
+    Counts requests, fresh vs reused connections and time spent in TCP/TLS handshakes; connection
+    counts and handshake time are also exported as Prometheus counters (see metrics.py).
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.handshake_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def add_connection(self, handshake: float) -> None:
+        with self._lock:
+            self.new_connections += 1
+            self.handshake_seconds += handshake
+        metrics.HTTP_CONNECTIONS.labels("new").inc()
+        metrics.HTTP_HANDSHAKE_SECONDS.inc(handshake)
+
+    def add_reuse(self) -> None:
+        with self._lock:
+            self.reused_connections += 1
+        metrics.HTTP_CONNECTIONS.labels("reused").inc()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": self.reused_connections,
+                "handshake_seconds": round(self.handshake_seconds, 4),
+            }
+
+pool_stats = PoolStats()
+
+class _HandshakeTrace:
+    """
+    httpcore trace hook for one request. connect_tcp only fires when a new connection is
+    opened; the handshake (TCP + TLS + HTTP/2 preface) lasts until the request headers go out.
+    """
+
+    def __init__(self):
+        self.started = None
+        self.sent = False
+
+    def __call__(self, event: str, info: Dict) -> None:
+        if event == "connection.connect_tcp.started":
+            self.started = time.perf_counter()
+        elif event.endswith(".send_request_headers.started") and not self.sent:
+            self.sent = True
+            if self.started is not None:
+                pool_stats.add_connection(time.perf_counter() - self.started)
+            else:
+                pool_stats.add_reuse()
+
+    async def atrace(self, event: str, info: Dict) -> None:
+        self(event, info)
+
+def _http2_enabled() -> bool:
+    if not HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        print("HTTP2=1 but the h2 package is missing, falling back to HTTP/1.1")
+        return False
+    return True
+
+def _client_kwargs() -> Dict:
+    return {
+        "limits": httpx.Limits(
+            max_connections=POOL_SIZE,
+            max_keepalive_connections=POOL_SIZE,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+        "http2": _http2_enabled(),
+        "timeout": DEFAULT_TIMEOUT,
+    }
+
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+# async clients are bound to the event loop that created them
+_async_clients: Dict[int, httpx.AsyncClient] = {}
+
+def get_client() -> httpx.Client:
+    """Process-wide blocking client with a keep-alive connection pool."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(**_client_kwargs())
+        return _client
+
+def get_async_client() -> httpx.AsyncClient:
+    """Pooled async client for the running event loop."""
+    key = id(asyncio.get_running_loop())
+    client = _async_clients.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(**_client_kwargs())
+        _async_clients[key] = client
+    return client
+
+async def close_async_client() -> None:
+    """Close the running loop's async client (call before the loop shuts down)."""
+    client = _async_clients.pop(id(asyncio.get_running_loop()), None)
+    if client is not None:
+        await client.aclose()
+
+def get(url: str, weight: float = 1, **kwargs) -> httpx.Response:
+    """Rate-limited GET over the shared pool."""
+    limiter.acquire(url, weight)
+    pool_stats.add_request()
+    try:
+        with metrics.HTTP_LATENCY.labels(metrics.endpoint(url)).time():
+            r = get_client().get(url, extensions={"trace": _HandshakeTrace()}, **kwargs)
+    except httpx.HTTPError:
+        metrics.ERRORS.labels("http").inc()
+        raise
+    limiter.observe(url, r)
+    if r.status_code >= 400:
+        metrics.ERRORS.labels("http").inc()
+    return r
+
+async def aget(url: str, weight: float = 1, **kwargs) -> httpx.Response:
+    """Rate-limited async GET over the running loop's shared pool."""
+    await limiter.acquire_async(url, weight)
+    pool_stats.add_request()
+    try:
+        with metrics.HTTP_LATENCY.labels(metrics.endpoint(url)).time():
+            r = await get_async_client().get(url, extensions={"trace": _HandshakeTrace().atrace}, **kwargs)
+    except httpx.HTTPError:
+        metrics.ERRORS.labels("http").inc()
+        raise
+    limiter.observe(url, r)
+    if r.status_code >= 400:
+        metrics.ERRORS.labels("http").inc()
+    return r
@@ -0,0 +1,158 @@
+# kline_store.py
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, Tuple
+
+COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+def _ordered(data: np.ndarray, pos: int, size: int) -> np.ndarray:
+    """Rows of a ring laid out in `data`, oldest first (a copy)."""
+    if size < len(data):
+        return data[:size].copy()
+    return np.concatenate((data[pos:], data[:pos]))
+
+def _open_memmap(path: str, capacity: int) -> Tuple[np.ndarray, np.ndarray | None]:
+    """
+    Open (or create) the on-disk ring for one buffer: a .npy of shape (capacity + 1, len(COLUMNS))
+    whose first row holds (pos, size). Returns the memmap and, when an existing file had another
+    capacity, its candles so they can be merged into the resized ring.
+    """
+    shape = (capacity + 1, len(COLUMNS))
+    carry = None
+    if os.path.exists(path):
+        try:
+            mm = np.lib.format.open_memmap(path, mode='r+')
+            if mm.shape == shape and mm.dtype == np.float64:
+                return mm, None
+            if mm.ndim == 2 and mm.shape[1] == len(COLUMNS):
+                carry = _ordered(np.asarray(mm[1:]), int(mm[0, 0]), int(mm[0, 1]))
+            del mm
+        except Exception as e:
+            print(f"kline cache {path} unreadable, recreating:", e)
+    mm = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=shape)
+    mm[:] = 0
+    return mm, carry
+
+class KlineBuffer:
+    """
+    Fixed-capacity ring buffer of candles for one symbol/interval, rows laid out as COLUMNS.
+    New candles overwrite the oldest ones; a candle with the same timestamp as the newest stored
+    one (the still-forming candle) is corrected in place.
+    With a `path` the ring lives in a memory-mapped .npy file, so it survives restarts and is
+    loaded without copying.
+    """
+
+    def __init__(self, capacity: int, path: str | None = None):
+        self.capacity = capacity
+        self.path = path
+        carry = None
+        if path is None:
+            self._raw = np.zeros((capacity + 1, len(COLUMNS)), dtype=np.float64)
+        else:
+            self._raw, carry = _open_memmap(path, capacity)
+        self.header = self._raw[0]  # (pos, size)
+        self.data = self._raw[1:]
+        if carry is not None:
+            self.merge(carry)
+
+    @property
+    def pos(self) -> int:
+        """Next write slot."""
+        return int(self.header[0])
+
+    @pos.setter
+    def pos(self, value: int) -> None:
+        self.header[0] = value
+
+    @property
+    def size(self) -> int:
+        return int(self.header[1])
+
+    @size.setter
+    def size(self, value: int) -> None:
+        self.header[1] = value
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def last_timestamp(self) -> int | None:
+        if not self.size:
+            return None
+        return int(self.data[(self.pos - 1) % self.capacity, 0])
+
+    def clear(self) -> None:
+        self.pos = 0
+        self.size = 0
+
+    def merge(self, rows: np.ndarray) -> int:
+        """Merge candles (ascending by timestamp) into the buffer. Returns how many new candles were added."""
+        if not len(rows):
+            return 0
+        last = self.last_timestamp
+        if last is not None:
+            rows = rows[rows[:, 0] >= last]
+            if len(rows) and rows[0, 0] == last:
+                self.data[(self.pos - 1) % self.capacity] = rows[0]
+                rows = rows[1:]
+        n = len(rows)
+        if not n:
+            return 0
+        if n >= self.capacity:
+            self.data[:] = rows[-self.capacity:]
+            self.pos = 0
+            self.size = self.capacity
+            return n
+        pos = self.pos
+        idx = (pos + np.arange(n)) % self.capacity
+        self.data[idx] = rows
+        self.pos = (pos + n) % self.capacity
+        self.size = min(self.capacity, self.size + n)
+        return n
+
+    def to_array(self) -> np.ndarray:
+        """Candles oldest first (a copy)."""
+        return _ordered(self.data, self.pos, self.size)
+
+    def frame(self) -> pd.DataFrame:
+        """Candles as the DataFrame shape fetch_klines returns (ascending, float OHLCV)."""
+        df = pd.DataFrame(self.to_array(), columns=COLUMNS)
+        df['timestamp'] = df['timestamp'].astype('int64')
+        return df
+
+    def flush(self) -> None:
+        if isinstance(self._raw, np.memmap):
+            self._raw.flush()
+
+class KlineStore:
+    """KlineBuffer per (symbol, interval); persisted as one memmap file each when `cache_dir` is set."""
+
+    def __init__(self, capacity: int, cache_dir: str | None = None):
+        self.capacity = capacity
+        self.cache_dir = cache_dir
+        self.buffers: Dict[Tuple[str, str], KlineBuffer] = {}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, symbol: str, interval: str) -> str | None:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{symbol}_{interval}.npy")
+
+    def buffer(self, symbol: str, interval: str) -> KlineBuffer:
+        key = (symbol, interval)
+        buf = self.buffers.get(key)
+        if buf is None:
+            buf = KlineBuffer(self.capacity, self._path(symbol, interval))
+            self.buffers[key] = buf
+        return buf
+
+    def update(self, symbol: str, interval: str, df: pd.DataFrame) -> KlineBuffer:
+        buf = self.buffer(symbol, interval)
+        buf.merge(df[COLUMNS].to_numpy(dtype=np.float64))
+        return buf
+
+    def flush(self) -> None:
+        for buf in self.buffers.values():
+            buf.flush()
@@ -0,0 +1,52 @@
+# metrics.py
+"""
+Prometheus metrics for the scan pipeline and the bot, served on METRICS_PORT (/metrics) next to
+the Telegram polling loop. Set METRICS_PORT=0 to disable the endpoint; the metrics themselves are
+always recorded (they're just counters in memory).
+"""
+import logging
+import os
+from urllib.parse import urlparse
+
+from prometheus_client import Counter, Histogram, start_http_server
+
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
+
+# per-symbol work is sub-millisecond to tens of ms; scans and replies take seconds
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 45.0, 60.0, 120.0, 300.0)
+
+HTTP_LATENCY = Histogram("signalx_http_request_seconds", "MEXC REST request latency", ["endpoint"])
+INDICATOR_SECONDS = Histogram("signalx_indicator_seconds", "Indicator update time per symbol", buckets=FAST_BUCKETS)
+SIGNAL_SECONDS = Histogram("signalx_signal_detection_seconds", "detect_signal_for_symbol time per symbol",
+                           buckets=FAST_BUCKETS)
+SCAN_SECONDS = Histogram("signalx_scan_seconds", "Full market scan time", ["mode"], buckets=SLOW_BUCKETS)
+REPLY_SECONDS = Histogram("signalx_suggest_reply_seconds", "/suggest end-to-end reply time", ["source"],
+                          buckets=SLOW_BUCKETS)
+
+ERRORS = Counter("signalx_errors_total", "Errors by pipeline stage", ["stage"])
+SIGNALS = Counter("signalx_signals_total", "Signals detected (memoized repeats not counted)", ["direction"])
+CACHE_HITS = Counter("signalx_cache_hits_total", "Cache hits", ["cache"])
+CACHE_MISSES = Counter("signalx_cache_misses_total", "Cache misses", ["cache"])
+# connection pool (http_client.PoolStats): requests on a fresh vs a kept-alive connection
+HTTP_CONNECTIONS = Counter("signalx_http_connections_total", "HTTP requests by connection kind", ["kind"])
+HTTP_HANDSHAKE_SECONDS = Counter("signalx_http_handshake_seconds_total",
+                                 "Time spent in TCP/TLS handshakes of new connections")
+
+def endpoint(url: str) -> str:
+    """Low-cardinality endpoint label: host + path, with the per-symbol part of kline paths dropped."""
+    parsed = urlparse(url)
+    path = parsed.path
+    if "/kline/" in path:
+        path = path[:path.index("/kline/") + len("/kline")]
+    return f"{parsed.hostname}{path}"
+
+def start_server(port: int = METRICS_PORT) -> None:
+    """Serve /metrics from a daemon thread (no-op for port 0)."""
+    if not port:
+        return
+    try:
+        start_http_server(port)
+        logging.info(f"Metrics on :{port}/metrics")
+    except OSError as e:
+        logging.error(f"Metrics endpoint not started on :{port}: {e}")
@@ -0,0 +1,170 @@
+# multi_timeframe.py
+"""
+Multi-timeframe scan: the smallest interval is fetched once per symbol and resampled locally into
+the higher timeframes, so scanning 5m/15m/1h/4h costs the API one kline series instead of four.
+"""
+import asyncio
+import os
+import time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+import metrics
+import suggest
+from kline_store import COLUMNS, KlineStore
+
+DEFAULT_TIMEFRAMES = "5m,15m,1h,4h"
+MTF_PAGE = 2000  # max candles the contract kline endpoint returns per request
+
+def parse_timeframes(value: str) -> List[str]:
+    """
+    Interval names from a comma-separated list such as SCAN_TIMEFRAMES; blanks and repeats are
+    dropped, and a name missing from suggest.INTERVAL_SECONDS raises ValueError.
+    """
+    names = list(dict.fromkeys(tf.strip() for tf in value.split(",") if tf.strip()))
+    unknown = [tf for tf in names if tf not in suggest.INTERVAL_SECONDS]
+    if unknown:
+        raise ValueError(f"SCAN_TIMEFRAMES: unsupported interval(s) {', '.join(unknown)} "
+                         f"(supported: {', '.join(suggest.INTERVAL_SECONDS)})")
+    return names
+
+# as configured (empty = single-timeframe scan); the multi-timeframe helpers default to all four
+SCAN_TIMEFRAMES = parse_timeframes(os.getenv("SCAN_TIMEFRAMES", ""))
+MTF_INTERVALS = SCAN_TIMEFRAMES or parse_timeframes(DEFAULT_TIMEFRAMES)
+
+def _base_capacity(intervals: List[str]) -> int:
+    secs = [suggest.INTERVAL_SECONDS[i] for i in intervals]
+    # enough base candles for KLINES_LIMIT candles of the largest timeframe
+    return suggest.KLINES_LIMIT * (max(secs) // min(secs))
+
+def _base_interval(intervals: List[str]) -> str:
+    return min(intervals, key=lambda i: suggest.INTERVAL_SECONDS[i])
+
+mtf_store = KlineStore(capacity=_base_capacity(MTF_INTERVALS),
+                       cache_dir=os.path.join(suggest.KLINE_CACHE_DIR, "mtf") if suggest.KLINE_CACHE_DIR else None)
+
+def resample(rows: np.ndarray, period: int) -> np.ndarray:
+    """
+    Aggregate ascending OHLCV rows (laid out as kline_store.COLUMNS, timestamps in seconds) into
+    `period`-second candles. A leading bucket that doesn't start on its boundary is incomplete and
+    dropped; the last bucket is kept even if still forming, like the exchange's own latest candle.
+    """
+    if not len(rows):
+        return rows
+    ts = rows[:, 0].astype(np.int64)
+    bucket = ts // period * period
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(rows)] - 1
+    out = np.empty((len(starts), len(COLUMNS)), dtype=np.float64)
+    out[:, 0] = bucket[starts]
+    out[:, 1] = rows[starts, 1]
+    out[:, 2] = np.maximum.reduceat(rows[:, 2], starts)
+    out[:, 3] = np.minimum.reduceat(rows[:, 3], starts)
+    out[:, 4] = rows[ends, 4]
+    out[:, 5] = np.add.reduceat(rows[:, 5], starts)
+    if ts[0] != bucket[0]:
+        out = out[1:]
+    return out
+
+async def fetch_base_klines(symbol: str, base: str, capacity: int, store: KlineStore | None = None) -> np.ndarray | None:
+    """
+    Refresh the base-interval candles of `symbol` in `store` (default mtf_store) and return them
+    (oldest first). A cold symbol is filled page by page from `capacity` candles back; afterwards
+    only candles from the last stored timestamp on are requested.
+    """
+    store = mtf_store if store is None else store
+    buf = store.buffer(symbol, base)
+    period = suggest.INTERVAL_SECONDS[base]
+    since = buf.last_timestamp
+    if since is not None and time.time() - since > capacity * period:
+        buf.clear()
+        since = None
+    if since is None:
+        start = int(time.time()) // period * period - capacity * period
+        while True:
+            df = await suggest.fetch_klines_async(symbol, interval=base, start=start)
+            if df is None or not len(df):
+                break
+            store.update(symbol, base, df)
+            if len(df) < MTF_PAGE:
+                break
+            start = buf.last_timestamp + period
+    else:
+        df = await suggest.fetch_klines_async(symbol, interval=base, start=since)
+        if df is None:
+            return None
+        store.update(symbol, base, df)
+    return buf.to_array() if len(buf) else None
+
+def timeframe_frames(rows: np.ndarray, intervals: List[str]) -> Dict[str, pd.DataFrame]:
+    """Kline frames (last KLINES_LIMIT candles) for each interval, resampled from the base rows."""
+    base_secs = min(suggest.INTERVAL_SECONDS[i] for i in intervals)
+    frames = {}
+    for interval in intervals:
+        period = suggest.INTERVAL_SECONDS[interval]
+        agg = rows if period == base_secs else resample(rows, period)
+        df = pd.DataFrame(agg[-suggest.KLINES_LIMIT:], columns=COLUMNS)
+        df['timestamp'] = df['timestamp'].astype('int64')
+        frames[interval] = df
+    return frames
+
+def rank_signals(signals: List[Dict], rank: bool = False) -> List[Dict]:
+    """
+    Order merged signals: symbols whose direction agrees across more timeframes first, then (with
+    `rank`) the higher signal score, then longer timeframes (fewer false crosses), then 24h volume.
+    """
+    agree: Dict[tuple, int] = {}
+    for sig in signals:
+        key = (sig['symbol'], sig['direction'])
+        agree[key] = agree.get(key, 0) + 1
+    return sorted(
+        signals,
+        key=lambda s: (agree[(s['symbol'], s['direction'])], (s.get('score') or 0.0) if rank else 0.0,
+                       suggest.INTERVAL_SECONDS[s['timeframe']], s['volume_24h']),
+        reverse=True,
+    )
+
+async def scan_multi_timeframe_async(pairs: List[Dict], limit: int = 3, intervals: List[str] = MTF_INTERVALS,
+                                     concurrency: int = suggest.SCAN_CONCURRENCY, rank: bool = False) -> List[Dict]:
+    """
+    Run detect_signal_for_symbol on every timeframe of every pair (closed candles only, see
+    suggest.closed_candles); return the `limit` best signals (see rank_signals).
+    """
+    base = _base_interval(intervals)
+    capacity = min(mtf_store.capacity, _base_capacity(intervals))
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(p: Dict) -> List[Dict]:
+        sym = p['symbol']
+        async with sem:
+            rows = await fetch_base_klines(sym, base, capacity)
+        if rows is None:
+            return []
+        found = []
+        for interval, df in timeframe_frames(rows, intervals).items():
+            df = suggest.closed_candles(df, interval)
+            try:
+                if len(df) < suggest.MIN_KLINES:
+                    continue
+                sig = suggest.evaluate_signal(sym, interval, df)
+                if sig:
+                    sig['timeframe'] = interval
+                    sig['volume_24h'] = round(p['quoteVolume'], 2)
+                    found.append(sig)
+            except Exception as e:
+                print("Error processing", sym, interval, e)
+                metrics.ERRORS.labels("scan").inc()
+        return found
+
+    results = await asyncio.gather(*(one(p) for p in pairs))
+    return rank_signals([sig for found in results for sig in found], rank=rank)[:limit]
+
+async def get_multi_timeframe_signals_async(limit: int = 3, min_volume_usdt: int = suggest.DEFAULT_MIN_VOLUME,
+                                            intervals: List[str] = MTF_INTERVALS, rank: bool = False) -> List[Dict]:
+    with metrics.SCAN_SECONDS.labels("multi_timeframe").time():
+        pairs = await asyncio.to_thread(suggest.fetch_high_volume_usdt_pairs, min_volume_usdt)
+        if not pairs:
+            return []
+        return await scan_multi_timeframe_async(pairs, limit=limit, intervals=intervals, rank=rank)
@@ -0,0 +1,146 @@
+# panel.py
+"""
+Batch mode for calculate_indicators / detect_signal_for_symbol: all symbols' candles are stacked
+into a (symbols x candles) panel and the indicators are computed for every symbol at once.
+Shorter histories are left-padded with NaN, which the recurrences skip exactly like pandas does,
+so each row matches calculate_indicators on that symbol's own frame.
+"""
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from suggest import MIN_KLINES, detect_signal_on_indicators
+
+# same parameters as suggest.calculate_indicators
+EMA_FAST = 7
+EMA_SLOW = 30
+RSI_WINDOW = 14
+VOL_MA_WINDOW = 20
+PANEL_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+def build_panel(frames: List[pd.DataFrame]) -> Dict[str, np.ndarray]:
+    """Stack kline frames into (S, N) float64 arrays, right-aligned on the latest candle."""
+    width = max((len(df) for df in frames), default=0)
+    panel = {col: np.full((len(frames), width), np.nan) for col in PANEL_COLUMNS}
+    for row, df in enumerate(frames):
+        n = len(df)
+        if not n:
+            continue
+        for col in PANEL_COLUMNS:
+            panel[col][row, width - n:] = df[col].to_numpy(dtype=np.float64)
+    return panel
+
+def ema(x: np.ndarray, span: int) -> np.ndarray:
+    """ewm(span, adjust=False).mean() along axis 1."""
+    alpha = 1.0 / (1.0 + (span - 1) / 2.0)
+    old_wt = 1.0 - alpha
+    out = np.empty_like(x)
+    w = x[:, 0].copy()
+    out[:, 0] = w
+    for i in range(1, x.shape[1]):
+        cur = x[:, i]
+        stepped = (old_wt * w + alpha * cur) / (old_wt + alpha)
+        w = np.where(w != w, cur, np.where((cur == cur) & (w != cur), stepped, w))
+        out[:, i] = w
+    return out
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """rolling(window, min_periods=1).mean() along axis 1, NaNs skipped, Kahan-compensated like pandas."""
+    S, N = x.shape
+    out = np.full((S, N), np.nan)
+    nobs = np.zeros(S, dtype=np.int64)
+    neg_ct = np.zeros(S, dtype=np.int64)
+    same_ct = np.zeros(S, dtype=np.int64)
+    sum_x = np.zeros(S)
+    comp_add = np.zeros(S)
+    comp_remove = np.zeros(S)
+    prev = np.full(S, np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for i in range(N):
+            if i >= window:
+                val = x[:, i - window]
+                obs = val == val
+                y = -val - comp_remove
+                t = sum_x + y
+                comp_remove = np.where(obs, t - sum_x - y, comp_remove)
+                sum_x = np.where(obs, t, sum_x)
+                nobs -= obs
+                neg_ct -= obs & np.signbit(val)
+            val = x[:, i]
+            obs = val == val
+            y = val - comp_add
+            t = sum_x + y
+            comp_add = np.where(obs, t - sum_x - y, comp_add)
+            sum_x = np.where(obs, t, sum_x)
+            nobs += obs
+            neg_ct += obs & np.signbit(val)
+            same_ct = np.where(obs, np.where(val == prev, same_ct + 1, 1), same_ct)
+            prev = np.where(obs, val, prev)
+            res = sum_x / nobs
+            res = np.select(
+                [same_ct >= nobs, (neg_ct == 0) & (res < 0), (neg_ct == nobs) & (res > 0)],
+                [prev, 0.0, 0.0],
+                res,
+            )
+            out[:, i] = np.where(nobs > 0, res, np.nan)
+    return out
+
+def calculate_indicators_batch(panel: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Add ema7/ema30/rsi/vol_ma20 (S, N) arrays plus last-candle cross/spike booleans (S,) to `panel`."""
+    close = panel['close']
+    out = dict(panel)
+    out['ema7'] = ema(close, EMA_FAST)
+    out['ema30'] = ema(close, EMA_SLOW)
+    delta = np.diff(close, axis=1, prepend=np.nan)
+    # the first real candle has no delta but still counts as a zero gain/loss, padding doesn't count
+    padded = close != close
+    gain = np.where(padded, np.nan, np.where(delta > 0, delta, 0.0))
+    loss = np.where(padded, np.nan, np.where(delta < 0, -delta, 0.0))
+    avg_gain = rolling_mean(gain, RSI_WINDOW)
+    avg_loss = rolling_mean(loss, RSI_WINDOW)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rs = avg_gain / np.where(avg_loss == 0, np.nan, avg_loss)
+        out['rsi'] = 100 - (100 / (1 + rs))
+    out['vol_ma20'] = rolling_mean(panel['volume'], VOL_MA_WINDOW)
+
+    if close.shape[1] >= 2:
+        e7, e30 = out['ema7'], out['ema30']
+        rsi = out['rsi'][:, -1]
+        out['ema_cross_up'] = (e7[:, -2] < e30[:, -2]) & (e7[:, -1] > e30[:, -1])
+        out['ema_cross_down'] = (e7[:, -2] > e30[:, -2]) & (e7[:, -1] < e30[:, -1])
+        out['rsi_ok_long'] = (rsi > 20) & (rsi < 70)
+        out['rsi_ok_short'] = (rsi > 30) & (rsi < 80)
+        out['vol_spike'] = panel['volume'][:, -1] > 1.5 * out['vol_ma20'][:, -1]
+    else:
+        no = np.zeros(close.shape[0], dtype=bool)
+        for key in ('ema_cross_up', 'ema_cross_down', 'rsi_ok_long', 'rsi_ok_short', 'vol_spike'):
+            out[key] = no
+    return out
+
+def _with_indicators(df: pd.DataFrame, ind: Dict[str, np.ndarray], row: int) -> pd.DataFrame:
+    n = len(df)
+    df = df.reset_index(drop=True).copy()
+    for col in ('ema7', 'ema30', 'rsi', 'vol_ma20'):
+        df[col] = ind[col][row, ind[col].shape[1] - n:]
+    return df
+
+def detect_signals_batch(items: List[Tuple[str, pd.DataFrame]]) -> List[Dict | None]:
+    """
+    detect_signal_for_symbol over a whole universe of (symbol, frame) pairs; returns one entry per
+    item (signal dict or None) in input order. EMA cross + RSI gates are evaluated for every symbol
+    in one vectorized pass; only the few symbols passing them go through the per-symbol
+    pattern and SL/TP logic.
+    """
+    results: List[Dict | None] = [None] * len(items)
+    live = [i for i, (_, df) in enumerate(items) if df is not None and len(df) >= MIN_KLINES]
+    if not live:
+        return results
+    frames = [items[i][1] for i in live]
+    ind = calculate_indicators_batch(build_panel(frames))
+    candidates = (ind['ema_cross_up'] & ind['rsi_ok_long']) | (ind['ema_cross_down'] & ind['rsi_ok_short'])
+    for row in np.flatnonzero(candidates):
+        i = live[row]
+        sym, df = items[i]
+        results[i] = detect_signal_on_indicators(_with_indicators(df, ind, row), sym)
+    return results
@@ -0,0 +1,153 @@
+# parallel_scan.py
+"""
+Process-pool mode for large universes (SCAN_WORKERS=N). Klines are still fetched on the event
+loop, but calculate_indicators + detect_signal_for_symbol run in worker processes, out of reach
+of the GIL. The candles of every dirty symbol are packed into one float64 block in
+multiprocessing.shared_memory; workers get only its name, shape and their (symbol, row range)
+slice list, so no DataFrames are pickled. Results come back in input order.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+import metrics
+import suggest
+from kline_store import COLUMNS
+
+SCAN_WORKERS = int(os.getenv("SCAN_WORKERS", "0"))  # >1 enables the process pool
+MIN_POOL_BATCH = 32  # fewer dirty symbols than this are evaluated in-process
+
+_pool: ProcessPoolExecutor | None = None
+
+def get_pool(workers: int = SCAN_WORKERS) -> ProcessPoolExecutor:
+    """Long-lived worker pool (spawned, so it's safe next to the bot's threads)."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+def _evaluate_chunk(shm_name: str, shape: Tuple[int, int],
+                    chunk: List[Tuple[str, int, int]]) -> List[Tuple[Dict | None, str | None]]:
+    """Worker side: (signal, error) for each (symbol, start, stop) slice of the shared block."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        block = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        out = []
+        for symbol, start, stop in chunk:
+            df = pd.DataFrame(block[start:stop].copy(), columns=COLUMNS)
+            df['timestamp'] = df['timestamp'].astype('int64')
+            try:
+                out.append((suggest.detect_signal_for_symbol(df, symbol), None))
+            except Exception as e:
+                out.append((None, str(e)))
+        del block
+        return out
+    finally:
+        shm.close()
+
+def _chunks(n: int, parts: int) -> List[range]:
+    bounds = np.linspace(0, n, min(n, parts) + 1).astype(int)
+    return [range(a, b) for a, b in zip(bounds[:-1], bounds[1:])]
+
+async def evaluate_frames(items: List[Tuple[str, pd.DataFrame]],
+                          workers: int = SCAN_WORKERS) -> List[Tuple[Dict | None, str | None]]:
+    """
+    detect_signal_for_symbol for every (symbol, frame) on the process pool; one (signal, error)
+    pair per item, in input order.
+    """
+    if not items:
+        return []
+    sizes = np.array([len(df) for _, df in items])
+    offsets = np.r_[0, np.cumsum(sizes)]
+    shape = (int(offsets[-1]), len(COLUMNS))
+    shm = shared_memory.SharedMemory(create=True, size=max(1, shape[0] * shape[1] * 8))
+    try:
+        block = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        for i, (_, df) in enumerate(items):
+            block[offsets[i]:offsets[i + 1]] = df[COLUMNS].to_numpy(dtype=np.float64)
+        del block
+        slices = [(sym, int(offsets[i]), int(offsets[i + 1])) for i, (sym, _) in enumerate(items)]
+        loop = asyncio.get_running_loop()
+        pool = get_pool(workers)
+        # a few chunks per worker evens out stragglers; gather keeps submission order
+        parts = await asyncio.gather(*(
+            loop.run_in_executor(pool, _evaluate_chunk, shm.name, shape, slices[r.start:r.stop])
+            for r in _chunks(len(slices), workers * 4)
+        ))
+    finally:
+        shm.close()
+        shm.unlink()
+    return [res for part in parts for res in part]
+
+async def scan_pairs_parallel_async(pairs: List[Dict], limit: int = 3, concurrency: int = suggest.SCAN_CONCURRENCY,
+                                    workers: int = SCAN_WORKERS, rank: bool = False) -> List[Dict]:
+    """
+    scan_pairs_async with signal evaluation on the process pool. Every pair is fetched (there is
+    no early exit), symbols whose last candle is unchanged are answered from signal_memo, and the
+    first `limit` signals in `pairs` (volume) order are returned, like the sequential scan, or
+    the `limit` best-scoring ones with `rank`.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def fetch(sym: str) -> pd.DataFrame | None:
+        async with sem:
+            df = await suggest.fetch_klines_incremental(sym, interval=suggest.INTERVAL)
+        return suggest.closed_candles(df, suggest.INTERVAL) if df is not None else None
+
+    frames = await asyncio.gather(*(fetch(p['symbol']) for p in pairs))
+    results: List[Dict | None] = [None] * len(pairs)
+    dirty = []
+    for i, (p, df) in enumerate(zip(pairs, frames)):
+        if df is None or len(df) < suggest.MIN_KLINES:
+            continue
+        hit, sig = suggest.signal_memo.lookup(p['symbol'], suggest.INTERVAL, df)
+        if hit:
+            results[i] = sig
+        else:
+            dirty.append(i)
+
+    if len(dirty) < MIN_POOL_BATCH or workers < 2:
+        for i in dirty:
+            try:
+                results[i] = suggest.evaluate_dirty(pairs[i]['symbol'], suggest.INTERVAL, frames[i])
+            except Exception as e:
+                print("Error processing", pairs[i]['symbol'], e)
+                metrics.ERRORS.labels("scan").inc()
+    else:
+        found = await evaluate_frames([(pairs[i]['symbol'], frames[i]) for i in dirty], workers=workers)
+        for i, (sig, error) in zip(dirty, found):
+            if error is not None:
+                print("Error processing", pairs[i]['symbol'], error)
+                metrics.ERRORS.labels("scan").inc()
+                continue
+            suggest.signal_memo.store(pairs[i]['symbol'], suggest.INTERVAL, frames[i], sig)
+            if sig:
+                metrics.SIGNALS.labels(sig['direction']).inc()
+            results[i] = sig
+
+    signals = []
+    for p, sig in zip(pairs, results):
+        if sig:
+            sig['volume_24h'] = round(p['quoteVolume'], 2)
+            signals.append(sig)
+    return suggest.top_signals(signals, limit) if rank else signals[:limit]
+
+async def get_trade_signals_parallel_async(limit: int = 3, min_volume_usdt: int = suggest.DEFAULT_MIN_VOLUME,
+                                           workers: int = SCAN_WORKERS, rank: bool = False) -> List[Dict]:
+    with metrics.SCAN_SECONDS.labels("process_pool").time():
+        pairs = await asyncio.to_thread(suggest.fetch_high_volume_usdt_pairs, min_volume_usdt)
+        if not pairs:
+            return []
+        return await scan_pairs_parallel_async(pairs, limit=limit, workers=workers, rank=rank)
@@ -0,0 +1,56 @@
+# patterns.py
+"""
+Vectorized candlestick patterns: each function takes whole OHLC float arrays and returns a boolean
+mask (one entry per candle) with the same rules as the scalar checks in suggest.py. Arrays may
+also be 2-D (symbols x candles); candles run along the last axis.
+"""
+import numpy as np
+
+def _ratios(o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray):
+    total = h - l
+    ok = total > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        body = np.abs(c - o) / total
+        lower = (np.minimum(o, c) - l) / total
+        upper = (h - np.maximum(o, c)) / total
+    return ok, body, lower, upper
+
+def _shift(x: np.ndarray) -> np.ndarray:
+    """Previous candle's value along the last axis (NaN for the first)."""
+    prev = np.empty_like(x)
+    prev[..., :1] = np.nan
+    prev[..., 1:] = x[..., :-1]
+    return prev
+
+def hammer(o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """Small body near the top, long lower shadow."""
+    ok, body, lower, upper = _ratios(o, h, l, c)
+    return ok & (body < 0.35) & (lower < 0.35) & (upper < 0.4)
+
+def shooting_star(o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """Small body, long upper shadow."""
+    ok, body, _, upper = _ratios(o, h, l, c)
+    return ok & (body < 0.35) & (upper > 0.6)
+
+def bullish_engulfing(o: np.ndarray, c: np.ndarray) -> np.ndarray:
+    o1, c1 = _shift(o), _shift(c)
+    return (c > o) & (c1 < o1) & (c > o1) & (o < c1)
+
+def bearish_engulfing(o: np.ndarray, c: np.ndarray) -> np.ndarray:
+    o1, c1 = _shift(o), _shift(c)
+    return (c < o) & (c1 > o1) & (c < o1) & (o > c1)
+
+def bullish_reversal(o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray) -> np.ndarray:
+    return hammer(o, h, l, c) | bullish_engulfing(o, c)
+
+def bearish_reversal(o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray) -> np.ndarray:
+    mask = bearish_engulfing(o, c) | shooting_star(o, h, l, c)
+    # the bearish checks need a previous candle, including the shooting star
+    mask[..., :1] = False
+    return mask
+
+def last_true(mask: np.ndarray) -> int:
+    """Index of the last True in `mask`, or -1."""
+    if not mask.any():
+        return -1
+    return len(mask) - 1 - int(np.argmax(mask[::-1]))
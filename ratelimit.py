@@ -0,0 +1,100 @@
+# ratelimit.py
+import asyncio
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+# MEXC weight budgets per host (capacity, window seconds)
+# spot v3: 500 weight / 10s per IP, contract public market data: 20 req / 2s
+MEXC_BUDGETS = {
+    "api.mexc.com": (500, 10.0),
+    "contract.mexc.com": (20, 2.0),
+}
+DEFAULT_BUDGET = (10, 1.0)
+
+MAX_BACKOFF = 60.0  # seconds
+
+class TokenBucket:
+    """
+    Weighted token bucket usable from threads and event loops alike.
+    Callers reserve tokens up front (the balance may go negative) and then sleep
+    off the deficit, so concurrent callers queue fairly instead of racing.
+    """
+
+    def __init__(self, capacity: float, window: float):
+        self.capacity = float(capacity)
+        self.rate = capacity / window  # tokens per second
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.backoff = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self, weight: float) -> float:
+        """Take `weight` tokens and return how long the caller must wait before sending."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= weight
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def acquire(self, weight: float = 1) -> None:
+        wait = self._reserve(weight)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, weight: float = 1) -> None:
+        wait = self._reserve(weight)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def observe(self, status: int, headers=None) -> None:
+        """Adapt to the server's answer: pause on 429/418 (honouring Retry-After), relax on success."""
+        with self._lock:
+            if status in (429, 418):
+                retry_after = None
+                if headers is not None:
+                    try:
+                        retry_after = float(headers.get("Retry-After"))
+                    except (TypeError, ValueError):
+                        retry_after = None
+                self.backoff = min(MAX_BACKOFF, self.backoff * 2 if self.backoff else 1.0)
+                pause = retry_after if retry_after is not None else self.backoff
+                self.blocked_until = max(self.blocked_until, time.monotonic() + pause)
+                # start from an empty bucket once the pause is over
+                self.tokens = min(self.tokens, 0.0)
+            elif status < 400:
+                self.backoff = 0.0
+
+class RateLimiter:
+    """Process-wide set of token buckets, one per API host."""
+
+    def __init__(self, budgets: Dict[str, tuple] = None):
+        self.budgets = dict(MEXC_BUDGETS if budgets is None else budgets)
+        self.buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).hostname or ""
+        with self._lock:
+            b = self.buckets.get(host)
+            if b is None:
+                b = TokenBucket(*self.budgets.get(host, DEFAULT_BUDGET))
+                self.buckets[host] = b
+            return b
+
+    def acquire(self, url: str, weight: float = 1) -> None:
+        self.bucket(url).acquire(weight)
+
+    async def acquire_async(self, url: str, weight: float = 1) -> None:
+        await self.bucket(url).acquire_async(weight)
+
+    def observe(self, url: str, response) -> None:
+        """Feed a requests/httpx response back into the bucket for its host."""
+        self.bucket(url).observe(response.status_code, response.headers)
+
+# shared by suggest.py and bot.py
+limiter = RateLimiter()
@@ -0,0 +1,99 @@
+# scanner.py
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, List
+
+import metrics
+import multi_timeframe
+import parallel_scan
+import suggest
+
+SNAPSHOT_LIMIT = 10  # signals kept per snapshot; /suggest shows the top few
+CLOSE_DELAY = 5  # seconds after candle close before scanning, so the exchange has finalized it
+# background scans are off the request path: score the whole universe and keep the best signals
+RANK_SIGNALS = os.getenv("RANK_SIGNALS", "1") == "1"
+
+class SignalSnapshot:
+    """Result of one background scan."""
+
+    def __init__(self, signals: List[Dict], scanned_at: float, duration: float):
+        self.signals = signals
+        self.scanned_at = scanned_at
+        self.duration = duration
+
+    def age(self) -> float:
+        return time.time() - self.scanned_at
+
+class BackgroundScanner:
+    """Runs the get_trade_suggestions pipeline off the request path and keeps the latest snapshot."""
+
+    def __init__(self, limit: int = SNAPSHOT_LIMIT, min_volume_usdt: int = suggest.DEFAULT_MIN_VOLUME,
+                 timeframes: List[str] | None = None):
+        self.limit = limit
+        self.min_volume_usdt = min_volume_usdt
+        self.timeframes = timeframes  # anything but [suggest.INTERVAL] -> multi-timeframe scan
+        self.snapshot: SignalSnapshot | None = None
+        self._lock = asyncio.Lock()
+
+    async def refresh(self) -> SignalSnapshot | None:
+        """Run one scan and publish it; a scan already in progress is not started twice."""
+        if self._lock.locked():
+            return self.snapshot
+        async with self._lock:
+            started = time.time()
+            try:
+                if self.timeframe_scan:
+                    signals = await multi_timeframe.get_multi_timeframe_signals_async(
+                        limit=self.limit, min_volume_usdt=self.min_volume_usdt, intervals=self.timeframes,
+                        rank=RANK_SIGNALS)
+                elif parallel_scan.SCAN_WORKERS > 1:
+                    signals = await parallel_scan.get_trade_signals_parallel_async(
+                        limit=self.limit, min_volume_usdt=self.min_volume_usdt, rank=RANK_SIGNALS)
+                else:
+                    signals = await suggest.get_trade_signals_async(
+                        limit=self.limit, min_volume_usdt=self.min_volume_usdt, rank=RANK_SIGNALS)
+            except Exception as e:
+                logging.error(f"Background scan failed: {e}")
+                metrics.ERRORS.labels("background_scan").inc()
+                return self.snapshot
+            self.snapshot = SignalSnapshot(signals, scanned_at=time.time(), duration=time.time() - started)
+            memo = suggest.signal_memo.stats()
+            logging.info(f"Background scan: {len(signals)} signals in {self.snapshot.duration:.1f}s, "
+                         f"memo hit rate {memo['hit_rate']:.0%} ({memo['hits']}/{memo['hits'] + memo['misses']})")
+            return self.snapshot
+
+    @property
+    def timeframe_scan(self) -> bool:
+        """
+        Whether scans go through multi_timeframe: any configured timeframes other than the default
+        interval, including a single one (SCAN_TIMEFRAMES=4h scans 4h candles, not INTERVAL's).
+        """
+        return bool(self.timeframes) and self.timeframes != [suggest.INTERVAL]
+
+    @property
+    def interval(self) -> str:
+        """Candle interval that paces the scans (the smallest timeframe)."""
+        if self.timeframe_scan:
+            return min(self.timeframes, key=lambda i: suggest.INTERVAL_SECONDS[i])
+        return suggest.INTERVAL
+
+    def publish(self, signals: List[Dict]) -> SignalSnapshot:
+        """Publish signals computed elsewhere (e.g. by the websocket stream on candle close)."""
+        self.snapshot = SignalSnapshot(signals[:self.limit], scanned_at=time.time(), duration=0.0)
+        return self.snapshot
+
+def seconds_until_candle_close(interval: str = suggest.INTERVAL, delay: float = CLOSE_DELAY) -> float:
+    """Seconds from now until `delay` after the next candle boundary of `interval`."""
+    period = suggest.INTERVAL_SECONDS[interval]
+    now = time.time()
+    return (now // period + 1) * period - now + delay
+
+def format_age(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60}m"
@@ -0,0 +1,47 @@
+# signal_memo.py
+from typing import Dict, Tuple
+
+import pandas as pd
+
+from metrics import CACHE_HITS, CACHE_MISSES
+
+class SignalMemo:
+    """
+    Remembers, per (symbol, interval), the last candle a signal was evaluated on and the result.
+    A symbol is dirty when its last candle differs (new candle, or the forming candle moved);
+    clean symbols are served from memory without recomputing indicators or signals.
+    The whole last candle is compared, not just time and close, because the high/low/volume of a
+    forming candle also feed the pattern and volume-spike checks.
+    """
+
+    def __init__(self):
+        self.entries: Dict[Tuple[str, str], Tuple[tuple, Dict | None]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _fingerprint(df: pd.DataFrame) -> tuple:
+        last = len(df) - 1
+        return (len(df),) + tuple(df.at[last, col] for col in ('timestamp', 'open', 'high', 'low', 'close', 'volume'))
+
+    def lookup(self, symbol: str, interval: str, df: pd.DataFrame) -> Tuple[bool, Dict | None]:
+        """(True, memoized signal copy) if nothing changed since the last evaluation, else (False, None)."""
+        entry = self.entries.get((symbol, interval))
+        if entry is not None and entry[0] == self._fingerprint(df):
+            self.hits += 1
+            CACHE_HITS.labels("signal_memo").inc()
+            return True, dict(entry[1]) if entry[1] is not None else None
+        self.misses += 1
+        CACHE_MISSES.labels("signal_memo").inc()
+        return False, None
+
+    def store(self, symbol: str, interval: str, df: pd.DataFrame, signal: Dict | None) -> None:
+        self.entries[(symbol, interval)] = (self._fingerprint(df), dict(signal) if signal is not None else None)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict:
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": round(self.hit_rate, 3)}
@@ -1,70 +1,160 @@
 # suggest.py
-import requests
+import asyncio
+import heapq
+import os
 import pandas as pd
 import numpy as np
 import math
 import time
 from typing import List, Dict
+import decode
+import http_client
+import metrics
+from ticker_cache import TTLCache
+from kline_store import COLUMNS, KlineStore
+import patterns
+import symbol_index
+import tickers
+from signal_memo import SignalMemo
 
 MEXC_TICKER_URL = "https://api.mexc.com/api/v3/ticker/24hr"
 MEXC_KLINES_URL = "https://contract.mexc.com/api/v1/contract/kline/{symbol}?interval={interval}&limit={limit}"
+MEXC_KLINES_SINCE_URL = "https://contract.mexc.com/api/v1/contract/kline/{symbol}?interval={interval}&start={start}"
+TICKER_WEIGHT = 40  # all-symbols 24hr ticker costs 40 of the spot weight budget
+KLINES_WEIGHT = 1
 
 DEFAULT_MIN_VOLUME = 40_000_000  # 40M USDT
 MIN_KLINES = 50  # require at least this many candles
 INTERVAL = "1h"
+INTERVAL_SECONDS = {"1m": 60, "5m": 300, "15m": 900, "30m": 1800, "1h": 3600, "4h": 14400, "1d": 86400}
 KLINES_LIMIT = 200
 MIN_RR = 2.2
+SCAN_CONCURRENCY = 8  # max kline requests in flight during a scan
+
+# signal score (0..1) used to rank a full-universe scan: weights of each feature and the value at
+# which a feature maxes out
+SCORE_WEIGHTS = {"cross": 0.3, "volume": 0.3, "rsi": 0.2, "sl": 0.2}
+CROSS_FULL = 0.005  # EMA7/EMA30 gap of 0.5% of price
+VOL_RATIO_FULL = 3.0  # volume 3x its 20-candle average
+SL_DISTANCE_ZERO = 0.05  # stop 5% away scores nothing
+
+def _load_spot_tickers() -> np.ndarray:
+    r = http_client.get(MEXC_TICKER_URL, weight=TICKER_WEIGHT)
+    r.raise_for_status()
+    return tickers.ticker_table(decode.loads(r.content))
+
+# the full 24h ticker list barely moves within a minute; share one download across all /suggest calls
+spot_tickers = TTLCache(_load_spot_tickers, name="spot_tickers")
 
 def fetch_high_volume_usdt_pairs(min_volume_usdt: int = DEFAULT_MIN_VOLUME) -> List[Dict]:
-    """Return list of dicts from MEXC ticker data for USDT pairs with quoteVolume >= min_volume_usdt."""
+    """
+    Return list of dicts from MEXC ticker data for USDT pairs with quoteVolume >= min_volume_usdt.
+    `symbol` is the pair's contract symbol (BTC_USDT, what the kline endpoint expects) and
+    `spot_symbol` the spot one; spot pairs without an open contract are left out.
+    """
     try:
-        r = requests.get(MEXC_TICKER_URL, timeout=8)
-        r.raise_for_status()
-        data = r.json()
+        data = spot_tickers.get()
     except Exception as e:
         print("fetch_high_volume_usdt_pairs error:", e)
+        metrics.ERRORS.labels("tickers").inc()
         return []
 
-    out = []
-    for item in data:
-        symbol = item.get("symbol")
-        if not symbol or not symbol.endswith("USDT"):
-            continue
-        quote_vol = float(item.get("quoteVolume") or 0)
-        if quote_vol >= min_volume_usdt:
-            out.append({
-                "symbol": symbol,
-                "quoteVolume": quote_vol,
-                "lastPrice": float(item.get("lastPrice") or 0)
-            })
-    # sort by volume desc
-    out.sort(key=lambda x: x["quoteVolume"], reverse=True)
-    return out
+    # sorted by volume desc
+    pairs = tickers.to_dicts(tickers.high_volume(data, min_volume_usdt, suffix="USDT"))
+    return symbol_index.to_contract_pairs(pairs)
+
+def _klines_to_frame(res) -> pd.DataFrame | None:
+    """Turn a decoded kline response into a DataFrame ascending by time with float columns."""
+    # contract API returns dict with code/data
+    if isinstance(res, dict) and res.get("code") != 200:
+        return None
+    data = res.get("data") if isinstance(res, dict) else res
+    if not data:
+        return None
+    if isinstance(data, dict):
+        # contract API returns parallel arrays: time/open/close/high/low/vol
+        klines = decode.contract_klines(data)
+    else:
+        klines = decode.kline_rows(data)
+    if not len(klines):
+        return None
+    df = pd.DataFrame(klines, columns=COLUMNS)
+    df['timestamp'] = df['timestamp'].astype('int64')
+    return df
 
 def fetch_klines(symbol: str, interval: str = INTERVAL, limit: int = KLINES_LIMIT) -> pd.DataFrame | None:
     """Fetch klines for contract API, return DataFrame ascending by time with float columns."""
     try:
         url = MEXC_KLINES_URL.format(symbol=symbol, interval=interval, limit=limit)
-        r = requests.get(url, timeout=8)
+        r = http_client.get(url, weight=KLINES_WEIGHT)
+        r.raise_for_status()
+        return _klines_to_frame(decode.loads(r.content))
+    except Exception as e:
+        print(f"fetch_klines {symbol} error:", e)
+        metrics.ERRORS.labels("klines").inc()
+        return None
+
+async def fetch_klines_async(symbol: str, interval: str = INTERVAL, limit: int = KLINES_LIMIT,
+                             start: int | None = None) -> pd.DataFrame | None:
+    """Async twin of fetch_klines over the shared connection pool. With `start`, only candles from that timestamp on."""
+    try:
+        if start is None:
+            url = MEXC_KLINES_URL.format(symbol=symbol, interval=interval, limit=limit)
+        else:
+            url = MEXC_KLINES_SINCE_URL.format(symbol=symbol, interval=interval, start=start)
+        r = await http_client.aget(url, weight=KLINES_WEIGHT)
         r.raise_for_status()
-        res = r.json()
-        # contract API returns dict with code/data
-        if isinstance(res, dict) and res.get("code") != 200:
-            return None
-        data = res.get("data") if isinstance(res, dict) else res
-        if not data:
-            return None
-        df = pd.DataFrame(data, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-        # reverse if returned newest first
-        if df.index[0] > df.index[-1]:
-            df = df.iloc[::-1].reset_index(drop=True)
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            df[col] = df[col].astype(float)
-        return df
+        return _klines_to_frame(decode.loads(r.content))
+    except asyncio.CancelledError:
+        raise
     except Exception as e:
         print(f"fetch_klines {symbol} error:", e)
+        metrics.ERRORS.labels("klines").inc()
         return None
 
+# on-disk kline cache (memmapped .npy per symbol) so restarts start warm; unset = memory only
+KLINE_CACHE_DIR = os.getenv("KLINE_CACHE_DIR")
+
+# per-symbol ring buffers so steady-state scans only download the newest candles
+kline_store = KlineStore(capacity=KLINES_LIMIT,
+                         cache_dir=os.path.join(KLINE_CACHE_DIR, "klines") if KLINE_CACHE_DIR else None)
+# last evaluated candle + result per symbol, so unchanged symbols skip indicators and signals
+signal_memo = SignalMemo()
+
+async def fetch_klines_incremental(symbol: str, interval: str = INTERVAL) -> pd.DataFrame | None:
+    """
+    Refresh the stored candles for symbol/interval and return them as a DataFrame.
+    The first call downloads full history (unless the disk cache already has it); later calls ask
+    only for candles from the last stored timestamp on, which also corrects the still-forming last
+    candle in place.
+    """
+    buf = kline_store.buffer(symbol, interval)
+    since = buf.last_timestamp
+    period = INTERVAL_SECONDS.get(interval)
+    if since is not None and period and time.time() - since > KLINES_LIMIT * period:
+        # stored candles (e.g. from the disk cache after a long downtime) are too old to extend
+        buf.clear()
+        since = None
+    if since is None:
+        df = await fetch_klines_async(symbol, interval=interval, limit=KLINES_LIMIT)
+    else:
+        df = await fetch_klines_async(symbol, interval=interval, start=since)
+    if df is None:
+        return None
+    kline_store.update(symbol, interval, df)
+    return buf.frame() if len(buf) else None
+
+def closed_candles(df: pd.DataFrame, interval: str = INTERVAL, now: float | None = None) -> pd.DataFrame:
+    """
+    `df` without its last candle if that one is still forming. Scans run just after a candle
+    boundary, when the newest candle has only seconds of data; signals are evaluated on the candle
+    that just closed, like the websocket stream does.
+    """
+    now = time.time() if now is None else now
+    if len(df) and df['timestamp'].iat[-1] + INTERVAL_SECONDS[interval] > now:
+        return df.iloc[:-1]
+    return df
+
 # simple candlestick pattern checks
 def is_bullish_engulfing(df: pd.DataFrame, idx: int) -> bool:
     if idx < 1: return False
@@ -102,57 +192,115 @@ def find_reversal_candle_level(df: pd.DataFrame, lookback: int = 30, bullish=Tru
     If none found, fall back to recent swing low/high (min/max over lookback).
     """
     n = len(df)
-    for i in range(n-1, max(-1, n - lookback - 1), -1):
-        if bullish:
-            if is_hammer(df, i) or is_bullish_engulfing(df, i):
-                return df.at[i, 'low']
-        else:
-            # bearish patterns: bearish engulfing (reverse of bullish Engulfing) or inverted hammer/shooting star approximated
-            if i >= 1:
-                o, c = df.at[i, 'open'], df.at[i, 'close']
-                o1, c1 = df.at[i-1, 'open'], df.at[i-1, 'close']
-                bearish_engulfing = (c < o) and (c1 > o1) and (c < o1) and (o > c1)
-                # shooting star approx
-                body = abs(c - o)
-                total = df.at[i, 'high'] - df.at[i, 'low']
-                shooting_star = total > 0 and (body / total) < 0.35 and ((df.at[i, 'high'] - max(o, c)) / total) > 0.6
-                if bearish_engulfing or shooting_star:
-                    return df.at[i, 'high']
+    lo = max(0, n - lookback)
+    # one extra candle before the window so engulfing at `lo` sees its predecessor
+    base = max(0, lo - 1)
+    # a single conversion of the whole frame beats pulling four Series (or a column subset) out of it
+    rows = df.to_numpy(dtype=np.float64)[base:]
+    o, h, l, c = (rows[:, df.columns.get_loc(col)] for col in ('open', 'high', 'low', 'close'))
+    if bullish:
+        mask = patterns.bullish_reversal(o, h, l, c)
+    else:
+        # bearish patterns: bearish engulfing (reverse of bullish Engulfing) or inverted hammer/shooting star approximated
+        mask = patterns.bearish_reversal(o, h, l, c)
+    i = patterns.last_true(mask[lo - base:])
+    if i >= 0:
+        return float((l if bullish else h)[lo - base + i])
     # fallback
     if bullish:
-        return float(df['low'][-lookback:].min())
+        return float(l[lo - base:].min())
     else:
-        return float(df['high'][-lookback:].max())
+        return float(h[lo - base:].max())
 
-def detect_signal_for_symbol(df: pd.DataFrame, symbol: str) -> Dict | None:
+class CandleFeatures:
     """
-    Return a dict with signal info or None.
-    - uses EMA 7/30 cross, RSI filter, volume spike, and reversal candle SL/TP calc.
+    Everything the entry logic and the reason builder need about the latest candle, computed once.
+    The entry gates are filled by candle_features; the pattern flags and score magnitudes only by
+    entry_features, once a cross has passed its RSI filter (most candles never get that far).
     """
-    df = calculate_indicators(df)
-    if len(df) < MIN_KLINES:
-        return None
+    __slots__ = ('close', 'ema_cross_up', 'ema_cross_down', 'rsi_ok_long', 'rsi_ok_short',
+                 'vol_spike', 'hammer', 'bullish_engulfing', 'ema_gap', 'vol_ratio', 'rsi', '_latest')
 
+def candle_features(df: pd.DataFrame) -> CandleFeatures:
+    """Entry gates of the last candle of an indicator frame (see calculate_indicators)."""
     latest_idx = len(df) - 1
     prev_idx = latest_idx - 1
     latest = df.iloc[latest_idx]
     prev = df.iloc[prev_idx]
+    f = CandleFeatures()
+    f._latest = latest
+    f.close = float(latest['close'])
 
     # basic conditions
-    ema_cross_up = prev['ema7'] < prev['ema30'] and latest['ema7'] > latest['ema30']
-    ema_cross_down = prev['ema7'] > prev['ema30'] and latest['ema7'] < latest['ema30']
+    f.ema_cross_up = prev['ema7'] < prev['ema30'] and latest['ema7'] > latest['ema30']
+    f.ema_cross_down = prev['ema7'] > prev['ema30'] and latest['ema7'] < latest['ema30']
 
     # RSI filters (relaxed)
-    rsi_ok_long = (latest['rsi'] is np.nan) or (latest['rsi'] > 20 and latest['rsi'] < 70)
-    rsi_ok_short = (latest['rsi'] is np.nan) or (latest['rsi'] > 30 and latest['rsi'] < 80)
+    f.rsi_ok_long = (latest['rsi'] is np.nan) or (latest['rsi'] > 20 and latest['rsi'] < 70)
+    f.rsi_ok_short = (latest['rsi'] is np.nan) or (latest['rsi'] > 30 and latest['rsi'] < 80)
 
     # volume spike relative to 20-ma
-    vol_spike = latest['volume'] > 1.5 * latest['vol_ma20']
+    f.vol_spike = latest['volume'] > 1.5 * latest['vol_ma20']
+    return f
+
+def entry_features(df: pd.DataFrame, f: CandleFeatures) -> CandleFeatures:
+    """Adds the reversal-pattern flags and the score magnitudes to `f`."""
+    latest = f._latest
+    latest_idx = len(df) - 1
+    f.hammer = is_hammer(df, latest_idx)
+    f.bullish_engulfing = is_bullish_engulfing(df, latest_idx)
+
+    # magnitudes for the signal score
+    f.ema_gap = abs(float(latest['ema7']) - float(latest['ema30'])) / f.close if f.close else 0.0
+    f.vol_ratio = float(latest['volume']) / float(latest['vol_ma20']) if latest['vol_ma20'] > 0 else 1.0
+    f.rsi = float(latest['rsi'])
+    return f
+
+def signal_score(f: CandleFeatures, long: bool, entry: float, sl_price: float) -> float:
+    """
+    0..1 quality of a signal: how decisively the EMAs crossed, how strong the volume spike is, how
+    much room RSI has before its limit, and how close the stop is (a near stop puts the MIN_RR
+    target within reach).
+    """
+    cross = min(f.ema_gap / CROSS_FULL, 1.0)
+    volume = min(max((f.vol_ratio - 1.0) / (VOL_RATIO_FULL - 1.0), 0.0), 1.0)
+    if math.isnan(f.rsi):
+        rsi = 0.5
+    elif long:
+        rsi = min(max((70 - f.rsi) / (70 - 20), 0.0), 1.0)
+    else:
+        rsi = min(max((f.rsi - 30) / (80 - 30), 0.0), 1.0)
+    sl = 1.0 - min(abs(entry - sl_price) / entry / SL_DISTANCE_ZERO, 1.0) if entry else 0.0
+    w = SCORE_WEIGHTS
+    return round(w["cross"] * cross + w["volume"] * volume + w["rsi"] * rsi + w["sl"] * sl, 4)
+
+def top_signals(signals: List[Dict], k: int) -> List[Dict]:
+    """The `k` highest-scoring signals (heap selection; equal scores keep their input order)."""
+    return heapq.nlargest(k, signals, key=lambda s: s.get('score') or 0.0)
+
+def detect_signal_for_symbol(df: pd.DataFrame, symbol: str) -> Dict | None:
+    """
+    Return a dict with signal info or None.
+    - uses EMA 7/30 cross, RSI filter, volume spike, and reversal candle SL/TP calc.
+    """
+    return detect_signal_on_indicators(calculate_indicators(df), symbol)
+
+def detect_signal_on_indicators(df: pd.DataFrame, symbol: str) -> Dict | None:
+    """detect_signal_for_symbol on a frame that already has the calculate_indicators columns."""
+    if len(df) < MIN_KLINES:
+        return None
+
+    f = candle_features(df)
+    long_gate = f.ema_cross_up and f.rsi_ok_long
+    short_gate = f.ema_cross_down and f.rsi_ok_short
+    if not (long_gate or short_gate):
+        return None
+    entry_features(df, f)
 
     # build signals: require EMA cross + (volume spike or candlestick reversal or favorable RSI)
     # LONG
-    if ema_cross_up and rsi_ok_long and (vol_spike or is_hammer(df, latest_idx) or is_bullish_engulfing(df, latest_idx)):
-        entry = float(latest['close'])
+    if long_gate and (f.vol_spike or f.hammer or f.bullish_engulfing):
+        entry = f.close
         # sl = low of reversal candle (if found) or recent swing low
         sl_price = find_reversal_candle_level(df, lookback=30, bullish=True)
         if sl_price >= entry:
@@ -163,10 +311,10 @@ def detect_signal_for_symbol(df: pd.DataFrame, symbol: str) -> Dict | None:
         # final RR calc
         rr_calc = (tp_price - entry) / max(1e-9, (entry - sl_price))
         reason_parts = []
-        if vol_spike: reason_parts.append("volume spike")
-        if is_hammer(df, latest_idx): reason_parts.append("hammer reversal")
-        if is_bullish_engulfing(df, latest_idx): reason_parts.append("bullish engulfing")
-        if prev['ema7'] < prev['ema30'] and latest['ema7'] > latest['ema30']: reason_parts.append("EMA 7 crossed above EMA 30")
+        if f.vol_spike: reason_parts.append("volume spike")
+        if f.hammer: reason_parts.append("hammer reversal")
+        if f.bullish_engulfing: reason_parts.append("bullish engulfing")
+        if f.ema_cross_up: reason_parts.append("EMA 7 crossed above EMA 30")
         reason = ", ".join(reason_parts) if reason_parts else "EMA crossover"
         return {
             "symbol": symbol,
@@ -176,12 +324,13 @@ def detect_signal_for_symbol(df: pd.DataFrame, symbol: str) -> Dict | None:
             "take_profit": round(float(tp_price), 6),
             "rr": round(rr_calc, 2),
             "volume_24h": None,
-            "reason": reason
+            "reason": reason,
+            "score": signal_score(f, True, entry, float(sl_price)),
         }
 
     # SHORT
-    if ema_cross_down and rsi_ok_short and (vol_spike or (not is_hammer(df, latest_idx) and (not is_bullish_engulfing(df, latest_idx)) )):
-        entry = float(latest['close'])
+    if short_gate and (f.vol_spike or (not f.hammer and not f.bullish_engulfing)):
+        entry = f.close
         sl_price = find_reversal_candle_level(df, lookback=30, bullish=False)
         if sl_price <= entry:
             sl_price = entry * 1.005
@@ -189,9 +338,8 @@ def detect_signal_for_symbol(df: pd.DataFrame, symbol: str) -> Dict | None:
         tp_price = entry - (sl_price - entry) * rr
         rr_calc = (entry - tp_price) / max(1e-9, (sl_price - entry))
         reason_parts = []
-        if vol_spike: reason_parts.append("volume spike")
-        # detect bearish engulfing
-        if prev['ema7'] > prev['ema30'] and latest['ema7'] < latest['ema30']: reason_parts.append("EMA 7 crossed below EMA 30")
+        if f.vol_spike: reason_parts.append("volume spike")
+        if f.ema_cross_down: reason_parts.append("EMA 7 crossed below EMA 30")
         reason = ", ".join(reason_parts) if reason_parts else "EMA crossover"
         return {
             "symbol": symbol,
@@ -201,48 +349,114 @@ def detect_signal_for_symbol(df: pd.DataFrame, symbol: str) -> Dict | None:
             "take_profit": round(float(tp_price), 6),
             "rr": round(rr_calc, 2),
             "volume_24h": None,
-            "reason": reason
+            "reason": reason,
+            "score": signal_score(f, False, entry, float(sl_price)),
         }
 
     return None
 
-def get_trade_suggestions(limit: int = 3, min_volume_usdt: int = DEFAULT_MIN_VOLUME) -> List[str]:
+def evaluate_signal(symbol: str, interval: str, df: pd.DataFrame) -> Dict | None:
+    """detect_signal_for_symbol on a kline frame, served from signal_memo when the last candle hasn't changed."""
+    hit, sig = signal_memo.lookup(symbol, interval, df)
+    if hit:
+        return sig
+    return evaluate_dirty(symbol, interval, df)
+
+def evaluate_dirty(symbol: str, interval: str, df: pd.DataFrame) -> Dict | None:
+    """evaluate_signal for a frame already known to miss the memo; stores the result in it."""
+    with metrics.INDICATOR_SECONDS.time():
+        ind = calculate_indicators(df)
+    with metrics.SIGNAL_SECONDS.time():
+        sig = detect_signal_on_indicators(ind, symbol)
+    signal_memo.store(symbol, interval, df, sig)
+    if sig:
+        metrics.SIGNALS.labels(sig['direction']).inc()
+    return sig
+
+def format_suggestion(sig: Dict) -> str:
+    """Render a signal dict as a markdown message."""
+    return (
+        f"📌 *{sig['symbol']}*  \n"
+        f"Direction: *{sig['direction']}*  \n"
+        f"Entry: `{sig['entry']}`  \n"
+        f"Stop-Loss: `{sig['stop_loss']}`  \n"
+        f"Take-Profit: `{sig['take_profit']}`  \n"
+        f"RR: `{sig['rr']}`  \n"
+        f"24h Volume: `${sig['volume_24h']:,}`  \n"
+        + (f"Timeframe: `{sig['timeframe']}`  \n" if sig.get('timeframe') else "")
+        + (f"Score: `{sig['score']:.2f}`  \n" if sig.get('score') is not None else "")
+        + f"Reason: _{sig['reason']}_"
+    )
+
+async def scan_pairs_async(pairs: List[Dict], limit: int = 3, concurrency: int = SCAN_CONCURRENCY,
+                           rank: bool = False) -> List[Dict]:
+    """
+    Refresh klines for all pairs concurrently (at most `concurrency` requests in flight over the
+    shared connection pool) and return up to `limit` signals, evaluated on closed candles. Results are consumed in the same
+    (volume) order as `pairs`, so the output matches a sequential scan; once `limit` signals
+    are found the remaining fetches are cancelled.
+    With `rank`, every pair is scanned and the `limit` best-scoring signals are returned instead.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def fetch(sym: str) -> pd.DataFrame | None:
+        async with sem:
+            df = await fetch_klines_incremental(sym, interval=INTERVAL)
+        return closed_candles(df, INTERVAL) if df is not None else None
+
+    tasks = [asyncio.create_task(fetch(p['symbol'])) for p in pairs]
+    signals = []
+    try:
+        for p, task in zip(pairs, tasks):
+            sym = p['symbol']
+            try:
+                df = await task
+                if df is None or len(df) < MIN_KLINES:
+                    continue
+                sig = evaluate_signal(sym, INTERVAL, df)
+                if sig:
+                    sig['volume_24h'] = round(p['quoteVolume'], 2)
+                    signals.append(sig)
+                    if len(signals) >= limit and not rank:
+                        break
+            except Exception as e:
+                print("Error processing", sym, e)
+                metrics.ERRORS.labels("scan").inc()
+                continue
+    finally:
+        # early exit (or error): drop fetches still in flight
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return top_signals(signals, limit) if rank else signals
+
+async def get_trade_signals_async(limit: int = 3, min_volume_usdt: int = DEFAULT_MIN_VOLUME,
+                                  rank: bool = False) -> List[Dict]:
+    """
+    Scan high-volume pairs and return up to `limit` signal dicts, highest volume first
+    (best score first with `rank`, see scan_pairs_async).
+    """
+    with metrics.SCAN_SECONDS.labels("single").time():
+        pairs = await asyncio.to_thread(fetch_high_volume_usdt_pairs, min_volume_usdt)
+        if not pairs:
+            return []
+        return await scan_pairs_async(pairs, limit=limit, rank=rank)
+
+async def get_trade_suggestions_async(limit: int = 3, min_volume_usdt: int = DEFAULT_MIN_VOLUME) -> List[str]:
     """
     Scan high-volume pairs and return up to `limit` formatted suggestion strings.
     """
-    out_messages = []
-    pairs = fetch_high_volume_usdt_pairs(min_volume_usdt)
-    if not pairs:
-        return []
+    signals = await get_trade_signals_async(limit=limit, min_volume_usdt=min_volume_usdt)
+    return [format_suggestion(sig) for sig in signals]
 
-    # iterate through top pairs, fetch klines and detect signals
-    for p in pairs:
-        sym = p['symbol']
+def get_trade_suggestions(limit: int = 3, min_volume_usdt: int = DEFAULT_MIN_VOLUME) -> List[str]:
+    """
+    Scan high-volume pairs and return up to `limit` formatted suggestion strings.
+    Blocking wrapper around get_trade_suggestions_async; don't call from a running event loop.
+    """
+    async def run():
         try:
-            df = fetch_klines(sym, interval=INTERVAL, limit=KLINES_LIMIT)
-            if df is None or len(df) < MIN_KLINES:
-                continue
-            sig = detect_signal_for_symbol(df, sym)
-            if sig:
-                sig['volume_24h'] = round(p['quoteVolume'], 2)
-                # format message (markdown)
-                msg = (
-                    f"📌 *{sig['symbol']}*  \n"
-                    f"Direction: *{sig['direction']}*  \n"
-                    f"Entry: `{sig['entry']}`  \n"
-                    f"Stop-Loss: `{sig['stop_loss']}`  \n"
-                    f"Take-Profit: `{sig['take_profit']}`  \n"
-                    f"RR: `{sig['rr']}`  \n"
-                    f"24h Volume: `${sig['volume_24h']:,}`  \n"
-                    f"Reason: _{sig['reason']}_"
-                )
-                out_messages.append(msg)
-                if len(out_messages) >= limit:
-                    break
-        except Exception as e:
-            print("Error processing", sym, e)
-            continue
-        # small delay to be polite to API
-        time.sleep(0.2)
-
-    return out_messages
+            return await get_trade_suggestions_async(limit=limit, min_volume_usdt=min_volume_usdt)
+        finally:
+            await http_client.close_async_client()
+    return asyncio.run(run())
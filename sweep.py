@@ -0,0 +1,126 @@
+# sweep.py
+"""
+Parameter sweep of the strategy's tunable numbers (backtest.DEFAULT_PARAMS) over stored history.
+The panel and the parameter-independent columns (RSI, volume MA, reversal SL levels) are built
+once per worker process; EMAs are cached per span, so each parameter set only pays for its entry
+masks and trade simulation.
+
+    python sweep.py --days 365 --workers 8                # full grid
+    python sweep.py --days 365 --random 200 --seed 1      # random search
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List
+
+import pandas as pd
+
+import backtest
+import suggest
+from panel import build_panel
+
+# candidate values per parameter; the live defaults are always included
+GRID = {
+    "min_rr": [1.5, 2.0, 2.2, 2.5, 3.0],
+    "ema_fast": [5, 7, 9, 12],
+    "ema_slow": [21, 30, 50],
+    "rsi_long_low": [20, 30],
+    "rsi_long_high": [65, 70, 75],
+    "rsi_short_low": [25, 30],
+    "rsi_short_high": [70, 80],
+    "vol_mult": [1.2, 1.5, 2.0],
+}
+
+_worker: Dict = {}
+
+def _init_worker(frames: Dict[str, pd.DataFrame], max_hold: int) -> None:
+    panel = build_panel(list(frames.values()))
+    _worker['panel'] = panel
+    _worker['ts'] = backtest.build_timestamps(frames, panel['close'].shape[1])
+    _worker['symbols'] = list(frames)
+    _worker['features'] = backtest.prepare(panel)
+    _worker['max_hold'] = max_hold
+
+def _evaluate(params: Dict) -> Dict:
+    summary, _ = backtest.backtest_panel(_worker['panel'], _worker['ts'], _worker['symbols'],
+                                         max_hold=_worker['max_hold'], params=params,
+                                         features=_worker['features'])
+    return {**params, **summary}
+
+def _valid(params: Dict) -> bool:
+    return params['ema_fast'] < params['ema_slow'] and params['rsi_long_low'] < params['rsi_long_high'] \
+        and params['rsi_short_low'] < params['rsi_short_high']
+
+def grid_params(grid: Dict[str, List] = GRID) -> Iterator[Dict]:
+    keys = list(grid)
+    for values in itertools.product(*(grid[k] for k in keys)):
+        params = dict(zip(keys, values))
+        if _valid(params):
+            yield params
+
+def random_params(n: int, grid: Dict[str, List] = GRID, seed: int | None = None) -> List[Dict]:
+    """`n` distinct parameter sets drawn from the grid (fewer if the grid is smaller)."""
+    candidates = list(grid_params(grid))
+    return random.Random(seed).sample(candidates, min(n, len(candidates)))
+
+def rank(results: List[Dict], min_trades: int = 30) -> pd.DataFrame:
+    """Results table, best expectancy first; sets with fewer than `min_trades` closed trades sink to the bottom."""
+    table = pd.DataFrame(results)
+    if not len(table):
+        return table
+    table['enough_trades'] = table['trades'] >= min_trades
+    table = table.sort_values(['enough_trades', 'expectancy_r', 'trades'], ascending=[False, False, False],
+                              na_position='last', kind='stable')
+    return table.reset_index(drop=True)
+
+def run_sweep(frames: Dict[str, pd.DataFrame], param_sets: List[Dict], workers: int | None = None,
+              max_hold: int = backtest.MAX_HOLD, min_trades: int = 30) -> pd.DataFrame:
+    """Backtest every parameter set on a process pool; returns the ranked results table."""
+    if not frames or not param_sets:
+        return pd.DataFrame()
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(frames, max_hold)
+        results = [_evaluate(p) for p in param_sets]
+    else:
+        # sort by EMA spans so each worker's chunk reuses the EMAs it already cached
+        param_sets = sorted(param_sets, key=lambda p: (p['ema_fast'], p['ema_slow']))
+        chunk = max(1, len(param_sets) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(frames, max_hold)) as pool:
+            results = list(pool.map(_evaluate, param_sets, chunksize=chunk))
+    return rank(results, min_trades=min_trades)
+
+def _main(args) -> None:
+    symbols = [s for s in args.symbols.split(",") if s] if args.symbols else \
+        [p['symbol'] for p in suggest.fetch_high_volume_usdt_pairs(args.min_volume)][:args.top]
+    candles = args.days * 86400 // suggest.INTERVAL_SECONDS[args.interval]
+    frames = asyncio.run(backtest.load_history_async(symbols, args.interval, candles))
+    param_sets = random_params(args.random, seed=args.seed) if args.random else list(grid_params())
+    started = time.perf_counter()
+    table = run_sweep(frames, param_sets, workers=args.workers, max_hold=args.max_hold, min_trades=args.min_trades)
+    print(f"{len(param_sets)} parameter sets over {len(frames)} symbols in {time.perf_counter() - started:.1f}s")
+    if len(table):
+        print(table.head(args.show).to_string(index=False))
+        table.to_csv(args.out, index=False)
+        print("results written to", args.out)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep detect_signal_for_symbol's parameters over stored klines")
+    parser.add_argument("--symbols", help="comma-separated symbols (default: high-volume universe)")
+    parser.add_argument("--top", type=int, default=100)
+    parser.add_argument("--min-volume", type=int, default=suggest.DEFAULT_MIN_VOLUME)
+    parser.add_argument("--interval", default=suggest.INTERVAL)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--max-hold", type=int, default=backtest.MAX_HOLD)
+    parser.add_argument("--random", type=int, help="evaluate this many random parameter sets instead of the full grid")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--min-trades", type=int, default=30)
+    parser.add_argument("--show", type=int, default=20)
+    parser.add_argument("--out", default="sweep_results.csv")
+    _main(parser.parse_args())
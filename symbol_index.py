@@ -0,0 +1,129 @@
+# symbol_index.py
+"""
+Spot <-> contract symbol index. Spot tickers name pairs BTCUSDT, the contract kline endpoint
+BTC_USDT, and not every spot pair has a contract. The index is built from the contract detail
+metadata (tradable contracts only), cached in memory for SYMBOL_INDEX_TTL and persisted to disk,
+so a restart doesn't need the API and an API outage falls back to the last saved copy.
+"""
+import json
+import os
+import tempfile
+import time
+from typing import Dict, Iterable, List, Tuple
+
+import decode
+import http_client
+from ticker_cache import TTLCache
+
+CONTRACT_DETAIL_URL = "https://contract.mexc.com/api/v1/contract/detail"
+SYMBOL_INDEX_TTL = float(os.getenv("SYMBOL_INDEX_TTL", str(6 * 3600)))  # listings change rarely
+SYMBOL_INDEX_PATH = os.getenv("SYMBOL_INDEX_PATH") or os.path.join(
+    os.getenv("KLINE_CACHE_DIR") or tempfile.gettempdir(), "symbol_index.json")
+CONTRACT_OPEN = 0  # contract detail `state` of a tradable contract
+
+class SymbolIndex:
+    """Two-way map between spot symbols (BTCUSDT) and contract symbols (BTC_USDT)."""
+
+    def __init__(self, spot_to_contract: Dict[str, str]):
+        self.spot_to_contract = dict(spot_to_contract)
+        self.contract_to_spot = {c: s for s, c in self.spot_to_contract.items()}
+
+    @classmethod
+    def from_detail(cls, items: List[Dict]) -> "SymbolIndex":
+        """Index from the contract detail `data` list; contracts not open for trading are left out."""
+        mapping = {}
+        for item in items:
+            symbol, base, quote = item.get("symbol"), item.get("baseCoin"), item.get("quoteCoin")
+            if symbol and base and quote and item.get("state", CONTRACT_OPEN) == CONTRACT_OPEN:
+                mapping[f"{base}{quote}"] = symbol
+        return cls(mapping)
+
+    def __len__(self) -> int:
+        return len(self.spot_to_contract)
+
+    def contract(self, spot_symbol: str) -> str | None:
+        return self.spot_to_contract.get(spot_symbol)
+
+    def spot(self, contract_symbol: str) -> str | None:
+        return self.contract_to_spot.get(contract_symbol)
+
+    def has_contract(self, contract_symbol: str) -> bool:
+        return contract_symbol in self.contract_to_spot
+
+def guess_contract(spot_symbol: str, quote: str = "USDT") -> str | None:
+    """BTCUSDT -> BTC_USDT, for when no index is available at all."""
+    if spot_symbol.endswith(quote) and len(spot_symbol) > len(quote):
+        return f"{spot_symbol[:-len(quote)]}_{quote}"
+    return None
+
+def save(index: SymbolIndex, path: str | None = None) -> None:
+    path = path or SYMBOL_INDEX_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"saved_at": time.time(), "contracts": index.spot_to_contract}, f)
+    os.replace(tmp, path)
+
+def load(path: str | None = None) -> Tuple[SymbolIndex, float] | None:
+    """(index, saved_at) from disk, or None when there is no readable copy."""
+    try:
+        with open(path or SYMBOL_INDEX_PATH) as f:
+            saved = json.load(f)
+        return SymbolIndex(saved["contracts"]), float(saved["saved_at"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def fetch_index() -> SymbolIndex:
+    r = http_client.get(CONTRACT_DETAIL_URL)
+    r.raise_for_status()
+    index = SymbolIndex.from_detail(decode.loads(r.content).get("data") or [])
+    if not len(index):
+        raise ValueError("contract detail listed no open contracts")
+    return index
+
+def _load_index() -> SymbolIndex:
+    saved = load()
+    if saved is not None and time.time() - saved[1] < SYMBOL_INDEX_TTL:
+        return saved[0]
+    try:
+        index = fetch_index()
+    except Exception as e:
+        if saved is None:
+            raise
+        print("symbol index refresh failed, using saved copy:", e)
+        return saved[0]
+    try:
+        save(index)
+    except OSError as e:
+        print("symbol index not saved:", e)
+    return index
+
+# a stale index is still right for nearly every symbol, so serve it while a refresh runs
+index_cache = TTLCache(_load_index, ttl=SYMBOL_INDEX_TTL, max_stale=SYMBOL_INDEX_TTL, name="symbol_index")
+
+def _current() -> SymbolIndex | None:
+    try:
+        return index_cache.get()
+    except Exception as e:
+        print("symbol index unavailable, guessing contract symbols:", e)
+        return None
+
+def to_contract_pairs(pairs: Iterable[Dict]) -> List[Dict]:
+    """
+    Spot pairs re-keyed by their contract symbol (original kept as `spot_symbol`); pairs without
+    an open contract are dropped, so no kline request is wasted on them.
+    """
+    index = _current()
+    out = []
+    for p in pairs:
+        contract = index.contract(p['symbol']) if index is not None else guess_contract(p['symbol'])
+        if contract:
+            out.append({**p, "symbol": contract, "spot_symbol": p['symbol']})
+    return out
+
+def listed_contracts(symbols: Iterable[str]) -> List[str]:
+    """The contract symbols that are open for trading (all of them if no index is available)."""
+    index = _current()
+    if index is None:
+        return list(symbols)
+    return [s for s in symbols if index.has_contract(s)]
@@ -0,0 +1,75 @@
+# test_panel.py
+"""Batch mode must match calculate_indicators / detect_signal_for_symbol on every symbol's own frame."""
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from panel import build_panel, calculate_indicators_batch, detect_signals_batch
+from suggest import calculate_indicators, detect_signal_for_symbol
+
+INDICATORS = ['ema7', 'ema30', 'rsi', 'vol_ma20']
+
+def _frames(count: int, seed: int, min_len: int = 1, max_len: int = 200):
+    """Random-walk kline frames of ragged length, some with flat closes and zero-volume stretches."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for k in range(count):
+        n = int(rng.integers(min_len, max_len + 1))
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        volume = rng.lognormal(8, 1, n)
+        if k % 5 == 0 and n > 40:
+            close[n // 3:n // 3 + 20] = close[n // 3]
+            volume[n // 2:n // 2 + 25] = 0.0
+        open_ = close * (1 + rng.normal(0, 0.004, n))
+        frames.append(pd.DataFrame({
+            'timestamp': np.arange(n, dtype=np.int64) * 3600,
+            'open': open_,
+            'high': np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.004, n))),
+            'low': np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.004, n))),
+            'close': close,
+            'volume': volume,
+        }))
+    return frames
+
+class IndicatorBatchParity(unittest.TestCase):
+
+    def test_ragged_panel_matches_per_symbol(self):
+        frames = _frames(300, seed=1)
+        ind = calculate_indicators_batch(build_panel(frames))
+        width = ind['close'].shape[1]
+        for row, df in enumerate(frames):
+            expected = calculate_indicators(df)
+            for col in INDICATORS:
+                got = ind[col][row, width - len(df):]
+                self.assertTrue(np.array_equal(got, expected[col].to_numpy(), equal_nan=True),
+                                f"{col} differs for frame {row} ({len(df)} candles)")
+                # the left padding stays NaN
+                self.assertTrue(np.isnan(ind[col][row, :width - len(df)]).all())
+
+    def test_single_candle_panel(self):
+        frames = _frames(5, seed=2, max_len=1)
+        ind = calculate_indicators_batch(build_panel(frames))
+        for row, df in enumerate(frames):
+            expected = calculate_indicators(df)
+            for col in INDICATORS:
+                self.assertTrue(np.array_equal(ind[col][row], expected[col].to_numpy(), equal_nan=True))
+        self.assertFalse(ind['ema_cross_up'].any() or ind['ema_cross_down'].any())
+
+class SignalBatchParity(unittest.TestCase):
+
+    def test_matches_detect_signal_for_symbol(self):
+        frames = _frames(1000, seed=3, min_len=30)
+        items = [(f"SYM{k}_USDT", df) for k, df in enumerate(frames)]
+        expected = [detect_signal_for_symbol(df, sym) for sym, df in items]
+        self.assertGreater(sum(sig is not None for sig in expected), 0)
+        self.assertEqual(detect_signals_batch(items), expected)
+
+    def test_missing_and_short_frames(self):
+        frames = _frames(4, seed=4, min_len=60)
+        items = [("A", frames[0]), ("B", None), ("C", frames[1].iloc[:10]), ("D", frames[2])]
+        expected = [None if df is None else detect_signal_for_symbol(df, sym) for sym, df in items]
+        self.assertEqual(detect_signals_batch(items), expected)
+
+if __name__ == "__main__":
+    unittest.main()
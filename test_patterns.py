@@ -0,0 +1,101 @@
+# test_patterns.py
+"""Vectorized candlestick patterns must give the same answers as the scalar per-candle checks."""
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import patterns
+from suggest import find_reversal_candle_level, is_bullish_engulfing, is_hammer
+
+LOOKBACKS = (1, 5, 30, 60)
+
+def _frame(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = close * (1 + rng.normal(0, 0.004, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.004, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.004, n)))
+    # a few degenerate candles: high == low, and open == close
+    for i in range(3, n, 17):
+        high[i] = low[i] = open_[i] = close[i]
+    for i in range(7, n, 23):
+        open_[i] = close[i]
+    return pd.DataFrame({'timestamp': np.arange(n, dtype=np.int64) * 3600,
+                         'open': open_, 'high': high, 'low': low, 'close': close,
+                         'volume': rng.lognormal(8, 1, n)})
+
+def _is_bearish_reversal(df: pd.DataFrame, i: int) -> bool:
+    """The scalar bearish checks find_reversal_candle_level used before it was vectorized."""
+    if i < 1:
+        return False
+    o, c = df.at[i, 'open'], df.at[i, 'close']
+    o1, c1 = df.at[i-1, 'open'], df.at[i-1, 'close']
+    bearish_engulfing = (c < o) and (c1 > o1) and (c < o1) and (o > c1)
+    body = abs(c - o)
+    total = df.at[i, 'high'] - df.at[i, 'low']
+    shooting_star = total > 0 and (body / total) < 0.35 and ((df.at[i, 'high'] - max(o, c)) / total) > 0.6
+    return bool(bearish_engulfing or shooting_star)
+
+def _reference_level(df: pd.DataFrame, lookback: int, bullish: bool) -> float:
+    """Scalar find_reversal_candle_level: newest matching candle in the lookback, else swing low/high."""
+    n = len(df)
+    for i in range(n - 1, max(-1, n - lookback - 1), -1):
+        if bullish and (is_hammer(df, i) or is_bullish_engulfing(df, i)):
+            return df.at[i, 'low']
+        if not bullish and _is_bearish_reversal(df, i):
+            return df.at[i, 'high']
+    if bullish:
+        return float(df['low'][-lookback:].min())
+    return float(df['high'][-lookback:].max())
+
+def _ohlc(df: pd.DataFrame):
+    return tuple(df[col].to_numpy(dtype=np.float64) for col in ('open', 'high', 'low', 'close'))
+
+class PatternMasks(unittest.TestCase):
+
+    def test_masks_match_scalar_checks(self):
+        for seed in range(20):
+            df = _frame(120, seed)
+            o, h, l, c = _ohlc(df)
+            bull = patterns.bullish_reversal(o, h, l, c)
+            bear = patterns.bearish_reversal(o, h, l, c)
+            for i in range(len(df)):
+                self.assertEqual(bool(bull[i]), bool(is_hammer(df, i) or is_bullish_engulfing(df, i)), (seed, i))
+                self.assertEqual(bool(bear[i]), _is_bearish_reversal(df, i), (seed, i))
+            self.assertTrue(bull.any() and bear.any())
+
+    def test_2d_rows_match_1d(self):
+        frames = [_frame(80, seed) for seed in range(5)]
+        o, h, l, c = (np.vstack(cols) for cols in zip(*map(_ohlc, frames)))
+        for fn in (patterns.bullish_reversal, patterns.bearish_reversal):
+            panel = fn(o, h, l, c)
+            for row in range(len(frames)):
+                self.assertTrue(np.array_equal(panel[row], fn(o[row], h[row], l[row], c[row])))
+
+    def test_last_true(self):
+        self.assertEqual(patterns.last_true(np.array([], dtype=bool)), -1)
+        self.assertEqual(patterns.last_true(np.array([False, False])), -1)
+        self.assertEqual(patterns.last_true(np.array([True, False, True, False])), 2)
+
+class ReversalLevel(unittest.TestCase):
+
+    def test_matches_scalar_reference(self):
+        for seed in range(30):
+            df = _frame(200, seed)
+            for lookback in LOOKBACKS:
+                for bullish in (True, False):
+                    self.assertEqual(find_reversal_candle_level(df, lookback, bullish),
+                                     _reference_level(df, lookback, bullish), (seed, lookback, bullish))
+
+    def test_frames_shorter_than_lookback(self):
+        df = _frame(70, seed=99)
+        for n in range(1, 70):
+            short = df.iloc[:n].reset_index(drop=True)
+            for lookback in LOOKBACKS:
+                for bullish in (True, False):
+                    self.assertEqual(find_reversal_candle_level(short, lookback, bullish),
+                                     _reference_level(short, lookback, bullish), (n, lookback, bullish))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+# test_scan.py
+"""Scheduled scans must evaluate the candle that just closed, not the one that just opened."""
+import asyncio
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import scanner
+import suggest
+from signal_memo import SignalMemo
+
+PERIOD = suggest.INTERVAL_SECONDS[suggest.INTERVAL]
+BOUNDARY = 1_700_000_000 // PERIOD * PERIOD  # a candle boundary of INTERVAL
+
+def _frame(n: int, last_open: int) -> pd.DataFrame:
+    """n candles of INTERVAL, the newest opening at `last_open`."""
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame({
+        'timestamp': last_open - PERIOD * np.arange(n - 1, -1, -1, dtype=np.int64),
+        'open': close, 'high': close * 1.01, 'low': close * 0.99, 'close': close,
+        'volume': rng.lognormal(8, 1, n),
+    })
+
+class ClosedCandles(unittest.TestCase):
+
+    def test_forming_candle_is_dropped(self):
+        df = _frame(100, last_open=BOUNDARY)
+        closed = suggest.closed_candles(df, suggest.INTERVAL, now=BOUNDARY + scanner.CLOSE_DELAY)
+        self.assertEqual(len(closed), 99)
+        self.assertEqual(closed['timestamp'].iat[-1], BOUNDARY - PERIOD)
+
+    def test_closed_frame_is_kept(self):
+        df = _frame(100, last_open=BOUNDARY - PERIOD)
+        self.assertIs(suggest.closed_candles(df, suggest.INTERVAL, now=BOUNDARY + 1), df)
+
+class ScheduledScan(unittest.TestCase):
+
+    def _scan(self, frames, now):
+        """scan_pairs_async over one pair, returning the frames passed to evaluate_signal."""
+        seen = []
+        evaluate_signal = suggest.evaluate_signal
+
+        def evaluate(symbol, interval, df):
+            seen.append(df)
+            return evaluate_signal(symbol, interval, df)
+
+        fetch = mock.AsyncMock(side_effect=frames)
+        with mock.patch.object(suggest, "fetch_klines_incremental", fetch), \
+                mock.patch.object(suggest, "evaluate_signal", evaluate), \
+                mock.patch.object(suggest.time, "time", return_value=now):
+            for _ in frames:
+                asyncio.run(suggest.scan_pairs_async([{"symbol": "BTC_USDT", "quoteVolume": 1e8}]))
+        return seen
+
+    def test_scan_after_close_evaluates_closed_candle(self):
+        now = BOUNDARY + scanner.CLOSE_DELAY
+        seen = self._scan([_frame(200, last_open=BOUNDARY)], now)
+        self.assertEqual(len(seen), 1)
+        self.assertEqual(seen[0]['timestamp'].iat[-1], BOUNDARY - PERIOD)
+
+    def test_memo_hits_while_only_the_forming_candle_moves(self):
+        first = _frame(200, last_open=BOUNDARY)
+        second = first.copy()
+        second.loc[len(second) - 1, ['close', 'volume']] = [123.0, 456.0]
+        with mock.patch.object(suggest, "signal_memo", SignalMemo()):
+            self._scan([first, second], now=BOUNDARY + 600)
+            self.assertEqual(suggest.signal_memo.stats()['hits'], 1)
+
+class ScanRouting(unittest.TestCase):
+
+    def _refresh(self, timeframes):
+        scan = scanner.BackgroundScanner(timeframes=timeframes)
+        single = mock.AsyncMock(return_value=[])
+        multi = mock.AsyncMock(return_value=[])
+        with mock.patch.object(suggest, "get_trade_signals_async", single), \
+                mock.patch.object(scanner.multi_timeframe, "get_multi_timeframe_signals_async", multi), \
+                mock.patch.object(scanner.parallel_scan, "SCAN_WORKERS", 0):
+            asyncio.run(scan.refresh())
+        return scan, single, multi
+
+    def test_single_configured_timeframe_is_scanned_and_paces_scans(self):
+        scan, single, multi = self._refresh(["4h"])
+        self.assertEqual(scan.interval, "4h")
+        single.assert_not_called()
+        self.assertEqual(multi.call_args.kwargs['intervals'], ["4h"])
+        self.assertEqual(multi.call_args.kwargs['rank'], scanner.RANK_SIGNALS)
+
+    def test_default_interval_uses_the_single_scan(self):
+        for timeframes in (None, [], [suggest.INTERVAL]):
+            scan, single, multi = self._refresh(timeframes)
+            self.assertEqual(scan.interval, suggest.INTERVAL)
+            single.assert_called_once()
+            multi.assert_not_called()
+
+    def test_several_timeframes_pace_on_the_smallest(self):
+        scan, _, multi = self._refresh(["1h", "15m", "4h"])
+        self.assertEqual(scan.interval, "15m")
+        multi.assert_called_once()
+
+class MultiTimeframeRanking(unittest.TestCase):
+
+    def test_score_orders_after_agreement(self):
+        def sig(symbol, timeframe, score, volume=1e8):
+            return {"symbol": symbol, "direction": "Long", "timeframe": timeframe, "score": score, "volume_24h": volume}
+
+        signals = [sig("A", "4h", 0.2), sig("B", "15m", 0.9), sig("C", "1h", 0.5),
+                   sig("D", "15m", 0.1), sig("D", "1h", 0.3)]
+        ranked = scanner.multi_timeframe.rank_signals(signals, rank=True)
+        self.assertEqual([(s['symbol'], s['timeframe']) for s in ranked],
+                         [("D", "1h"), ("D", "15m"), ("B", "15m"), ("C", "1h"), ("A", "4h")])
+        unranked = scanner.multi_timeframe.rank_signals(signals)
+        self.assertEqual([s['symbol'] for s in unranked], ["D", "D", "A", "C", "B"])
+
+if __name__ == "__main__":
+    unittest.main()
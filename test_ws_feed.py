@@ -0,0 +1,48 @@
+# test_ws_feed.py
+"""The streamed snapshot must follow current_signals() on every candle close, signal or not."""
+import json
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import suggest
+from kline_store import KlineStore
+from scanner import BackgroundScanner
+from ws_feed import WS_INTERVALS, MarketStream
+
+PERIOD = suggest.INTERVAL_SECONDS[suggest.INTERVAL]
+SYMBOL = "BTC_USDT"
+
+def _kline_frame(ts: int, price: float) -> str:
+    return json.dumps({"channel": "push.kline", "data": {
+        "symbol": SYMBOL, "interval": WS_INTERVALS[suggest.INTERVAL],
+        "t": ts, "o": price, "h": price, "l": price, "c": price, "q": 1000.0,
+    }})
+
+class StreamSnapshot(unittest.TestCase):
+
+    def test_expired_signal_leaves_the_snapshot(self):
+        store = KlineStore(capacity=suggest.KLINES_LIMIT)
+        n = suggest.MIN_KLINES + 10
+        ts = np.arange(n, dtype=np.float64) * PERIOD
+        store.buffer(SYMBOL, suggest.INTERVAL).merge(
+            np.column_stack([ts, np.full((n, 5), 100.0)]))
+        signal = {"symbol": SYMBOL, "direction": "Long", "entry": 100.0}
+        detect = mock.Mock(side_effect=[dict(signal), None])
+
+        scanner = BackgroundScanner()
+        stream = MarketStream([SYMBOL], on_close=lambda sym: scanner.publish(stream.current_signals()))
+        with mock.patch.object(suggest, "kline_store", store), \
+                mock.patch.object(suggest, "detect_signal_for_symbol", detect):
+            last = int(ts[-1])
+            stream.handle(_kline_frame(last + PERIOD, 101.0))  # closes `last`: signal
+            self.assertEqual(len(scanner.snapshot.signals), 1)
+            stream.handle(_kline_frame(last + PERIOD, 102.0))  # forming candle update: no close
+            self.assertEqual(detect.call_count, 1)
+            stream.handle(_kline_frame(last + 2 * PERIOD, 103.0))  # next close: no signal
+            self.assertEqual(stream.current_signals(), [])
+            self.assertEqual(scanner.snapshot.signals, stream.current_signals())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+# ticker_cache.py
+import os
+import threading
+import time
+from typing import Any, Callable
+
+from metrics import CACHE_HITS, CACHE_MISSES
+
+TICKER_TTL = float(os.getenv("TICKER_TTL", "60"))  # seconds a ticker snapshot counts as fresh
+TICKER_MAX_STALE = float(os.getenv("TICKER_MAX_STALE", "300"))  # how long past TTL stale data may be served
+
+class _Flight:
+    """One upstream load that concurrent callers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+class TTLCache:
+    """
+    Single-value cache in front of an expensive loader (e.g. the full exchange ticker list).
+    - fresh (age < ttl): served from memory
+    - stale (age < ttl + max_stale): served from memory while one background thread refreshes
+    - missing/expired: callers block on a single shared upstream request (single-flight)
+    """
+
+    def __init__(self, loader: Callable[[], Any], ttl: float = TICKER_TTL, max_stale: float = TICKER_MAX_STALE,
+                 name: str = "cache"):
+        self.loader = loader
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.name = name
+        self.value = None
+        self.fetched_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self._flight: _Flight | None = None
+        self._lock = threading.Lock()
+
+    def _start_flight(self) -> _Flight:
+        flight = _Flight()
+        self._flight = flight
+        return flight
+
+    def _run(self, flight: _Flight) -> None:
+        try:
+            value = self.loader()
+            with self._lock:
+                self.value = value
+                self.fetched_at = time.monotonic()
+            flight.value = value
+        except Exception as e:
+            flight.error = e
+        finally:
+            with self._lock:
+                self._flight = None
+            flight.done.set()
+
+    def _refresh_in_background(self, flight: _Flight) -> None:
+        def run():
+            self._run(flight)
+            if flight.error is not None:
+                print(f"{self.name} background refresh error:", flight.error)
+        threading.Thread(target=run, name=f"{self.name}-refresh", daemon=True).start()
+
+    def get(self) -> Any:
+        """Return the cached value, loading it at most once no matter how many callers arrive."""
+        with self._lock:
+            age = time.monotonic() - self.fetched_at
+            if self.value is not None and age < self.ttl:
+                self.hits += 1
+                CACHE_HITS.labels(self.name).inc()
+                return self.value
+            if self.value is not None and age < self.ttl + self.max_stale:
+                self.hits += 1
+                CACHE_HITS.labels(self.name).inc()
+                if self._flight is None:
+                    self._refresh_in_background(self._start_flight())
+                return self.value
+            self.misses += 1
+            CACHE_MISSES.labels(self.name).inc()
+            flight = self._flight
+            leader = flight is None
+            if leader:
+                flight = self._start_flight()
+        if leader:
+            self._run(flight)
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.value = None
+            self.fetched_at = 0.0
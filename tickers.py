@@ -0,0 +1,39 @@
+# tickers.py
+"""
+24h ticker lists as structured NumPy tables (symbol, quoteVolume, lastPrice), shared by the spot
+universe in suggest.py and the contract universe in bot.py. A table is built once per ticker
+cache refresh; filtering and sorting are then vectorized masks and one argsort.
+"""
+from typing import Dict, List
+
+import numpy as np
+
+def ticker_dtype(symbol_len: int) -> np.dtype:
+    return np.dtype([('symbol', f'U{max(1, symbol_len)}'), ('quoteVolume', 'f8'), ('lastPrice', 'f8')])
+
+def ticker_table(items: List[Dict], volume_key: str = "quoteVolume", price_key: str = "lastPrice") -> np.ndarray:
+    """
+    Table from a decoded ticker list; `volume_key` / `price_key` name the quote volume and last
+    price fields (they differ between spot and contract). Missing or empty numbers count as 0, a
+    missing symbol as "".
+    """
+    symbols = np.array([item.get("symbol") or "" for item in items], dtype=str)
+    table = np.empty(len(items), dtype=ticker_dtype(symbols.dtype.itemsize // 4))
+    table['symbol'] = symbols
+    table['quoteVolume'] = np.array([item.get(volume_key) or 0 for item in items], dtype=np.float64)
+    table['lastPrice'] = np.array([item.get(price_key) or 0 for item in items], dtype=np.float64)
+    return table
+
+def high_volume(table: np.ndarray, min_volume: float, suffix: str | None = None) -> np.ndarray:
+    """Rows with quoteVolume >= min_volume (and symbol ending in `suffix`), highest volume first; ties keep table order."""
+    mask = table['quoteVolume'] >= min_volume
+    if suffix:
+        mask &= np.char.endswith(table['symbol'], suffix)
+    hits = table[mask]
+    return hits[np.argsort(-hits['quoteVolume'], kind='stable')]
+
+def to_dicts(table: np.ndarray) -> List[Dict]:
+    return [
+        {"symbol": symbol, "quoteVolume": quote_vol, "lastPrice": last}
+        for symbol, quote_vol, last in table.tolist()
+    ]
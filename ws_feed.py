@@ -0,0 +1,160 @@
+# ws_feed.py
+import asyncio
+import json
+import logging
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+import websockets
+
+import metrics
+import suggest
+
+MEXC_WS_URL = "wss://contract.mexc.com/edge"
+WS_PING_INTERVAL = 15  # seconds; MEXC drops connections without an app-level ping for 60s
+WS_MAX_BACKOFF = 30
+# REST interval names -> contract websocket names
+WS_INTERVALS = {"1m": "Min1", "5m": "Min5", "15m": "Min15", "30m": "Min30", "1h": "Min60", "4h": "Hour4", "1d": "Day1"}
+
+class MarketStream:
+    """
+    Streams MEXC contract klines and tickers for a fixed universe into suggest.kline_store.
+    When a symbol's next candle opens, its previous candle has closed and detect_signal_for_symbol
+    runs on the closed candles. `on_signal` gets each new signal; `on_close` gets the symbol after
+    every candle close, signal or not (a symbol's old signal expires then, so that's the hook for
+    republishing current_signals()). Optionally records every raw frame to a JSONL file for
+    ws_replay.py.
+    """
+
+    def __init__(self, symbols: List[str], interval: str = suggest.INTERVAL, url: str = MEXC_WS_URL,
+                 on_signal: Callable[[Dict], None] | None = None, on_close: Callable[[str], None] | None = None,
+                 record_path: str | None = None):
+        self.symbols = list(symbols)
+        self.interval = interval
+        self.url = url
+        self.on_signal = on_signal
+        self.on_close = on_close
+        self.record_path = record_path
+        self.tickers: Dict[str, Dict] = {}
+        self.signals: Dict[str, Dict] = {}  # latest signal per symbol
+        self.last_closed: Dict[str, int] = {}  # timestamp of the latest closed candle per symbol
+        self._record = None
+
+    async def backfill(self, concurrency: int = suggest.SCAN_CONCURRENCY) -> None:
+        """Load candle history over REST so closed-candle checks have enough data from the first close."""
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(sym: str):
+            async with sem:
+                await suggest.fetch_klines_incremental(sym, interval=self.interval)
+
+        await asyncio.gather(*(one(s) for s in self.symbols))
+
+    def _subscriptions(self) -> List[Dict]:
+        subs = [{"method": "sub.tickers", "param": {}}]
+        ws_interval = WS_INTERVALS[self.interval]
+        for sym in self.symbols:
+            subs.append({"method": "sub.kline", "param": {"symbol": sym, "interval": ws_interval}})
+        return subs
+
+    async def run(self) -> None:
+        """Connect, subscribe and consume forever, reconnecting with backoff."""
+        backoff = 1
+        if self.record_path:
+            self._record = open(self.record_path, "a")
+        try:
+            while True:
+                try:
+                    async with websockets.connect(self.url, ping_interval=None) as ws:
+                        for sub in self._subscriptions():
+                            await ws.send(json.dumps(sub))
+                        backoff = 1
+                        pinger = asyncio.create_task(self._ping(ws))
+                        try:
+                            async for raw in ws:
+                                self.handle(raw)
+                        finally:
+                            pinger.cancel()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logging.error(f"Market stream error: {e}, reconnecting in {backoff}s")
+                    metrics.ERRORS.labels("stream").inc()
+                await asyncio.sleep(backoff)
+                backoff = min(WS_MAX_BACKOFF, backoff * 2)
+        finally:
+            if self._record is not None:
+                self._record.close()
+                self._record = None
+
+    async def _ping(self, ws) -> None:
+        while True:
+            await asyncio.sleep(WS_PING_INTERVAL)
+            await ws.send(json.dumps({"method": "ping"}))
+
+    def handle(self, raw: str | bytes) -> None:
+        """Apply one websocket frame."""
+        if self._record is not None:
+            self._record.write(json.dumps({"t": time.time(), "frame": raw if isinstance(raw, str) else raw.decode()}) + "\n")
+        try:
+            msg = json.loads(raw)
+        except ValueError:
+            return
+        channel = msg.get("channel")
+        if channel == "push.kline":
+            self._on_kline(msg.get("data") or {})
+        elif channel == "push.tickers":
+            for t in msg.get("data") or []:
+                if t.get("symbol"):
+                    self.tickers[t["symbol"]] = t
+
+    def _on_kline(self, k: Dict) -> None:
+        sym = k.get("symbol")
+        if sym is None or k.get("interval") != WS_INTERVALS[self.interval]:
+            return
+        row = np.array([[k["t"], k["o"], k["h"], k["l"], k["c"], k["q"]]], dtype=np.float64)
+        buf = suggest.kline_store.buffer(sym, self.interval)
+        last = buf.last_timestamp
+        buf.merge(row)
+        if last is not None and int(k["t"]) > last:
+            self._on_candle_close(sym, last)
+
+    def _on_candle_close(self, sym: str, closed_ts: int) -> None:
+        self.last_closed[sym] = closed_ts
+        self._check_signal(sym, closed_ts)
+        if self.on_close is not None:
+            self.on_close(sym)
+
+    def _check_signal(self, sym: str, closed_ts: int) -> None:
+        df = suggest.kline_store.buffer(sym, self.interval).frame()
+        # evaluate on closed candles only, without the one that just opened
+        df = df.iloc[:-1]
+        if len(df) < suggest.MIN_KLINES:
+            return
+        try:
+            with metrics.SIGNAL_SECONDS.time():
+                sig = suggest.detect_signal_for_symbol(df, sym)
+        except Exception as e:
+            logging.error(f"Signal check for {sym} failed: {e}")
+            metrics.ERRORS.labels("stream").inc()
+            return
+        if sig is None:
+            self.signals.pop(sym, None)
+            return
+        metrics.SIGNALS.labels(sig['direction']).inc()
+        ticker = self.tickers.get(sym) or {}
+        sig['volume_24h'] = round(float(ticker.get("amount24") or 0), 2)
+        sig['candle_ts'] = closed_ts
+        self.signals[sym] = sig
+        if self.on_signal is not None:
+            self.on_signal(sig)
+
+    def current_signals(self) -> List[Dict]:
+        """Signals from each symbol's latest closed candle, in universe order."""
+        out = []
+        for sym in self.symbols:
+            sig = self.signals.get(sym)
+            if sig is not None and sig.get('candle_ts') == self.last_closed.get(sym):
+                out.append(sig)
+        return out
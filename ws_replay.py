@@ -0,0 +1,72 @@
+# ws_replay.py
+"""
+Local websocket server that replays frames recorded by MarketStream(record_path=...), for testing
+the streaming pipeline without MEXC:
+
+    python ws_replay.py frames.jsonl --port 8765 --speed 60
+
+then point MarketStream at ws://127.0.0.1:8765.
+"""
+import argparse
+import asyncio
+import json
+from typing import List, Tuple
+
+import websockets
+
+def load_frames(path: str) -> List[Tuple[float, str]]:
+    """(recorded time, raw frame) pairs in recording order."""
+    frames = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                rec = json.loads(line)
+                frames.append((float(rec["t"]), rec["frame"]))
+    return frames
+
+async def _drain(ws) -> None:
+    # subscriptions and pings from the client need no answer here; just keep reading them
+    async for raw in ws:
+        try:
+            if json.loads(raw).get("method") == "ping":
+                await ws.send(json.dumps({"channel": "pong"}))
+        except ValueError:
+            pass
+
+def make_handler(frames: List[Tuple[float, str]], speed: float = 0):
+    """Connection handler sending `frames` with their recorded spacing divided by `speed` (0 = no delay)."""
+
+    async def handler(ws):
+        reader = asyncio.create_task(_drain(ws))
+        try:
+            prev = None
+            for t, raw in frames:
+                if speed and prev is not None and t > prev:
+                    await asyncio.sleep((t - prev) / speed)
+                prev = t
+                await ws.send(raw)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            reader.cancel()
+
+    return handler
+
+async def serve(frames: List[Tuple[float, str]], host: str = "127.0.0.1", port: int = 8765, speed: float = 0):
+    """Start the replay server; returns the websockets server (use as an async context manager)."""
+    return await websockets.serve(make_handler(frames, speed), host, port)
+
+async def _main(args) -> None:
+    frames = load_frames(args.path)
+    async with await serve(frames, args.host, args.port, args.speed):
+        print(f"Replaying {len(frames)} frames on ws://{args.host}:{args.port}")
+        await asyncio.Future()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded MEXC websocket frames")
+    parser.add_argument("path")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--speed", type=float, default=0, help="replay speed multiplier, 0 = as fast as possible")
+    asyncio.run(_main(parser.parse_args()))